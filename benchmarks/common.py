@@ -0,0 +1,19 @@
+from ueca.data import PhysicsData
+
+
+def build_symbols(n_symbols):
+    return [PhysicsData(1.0 + i, "meter", symbol=f"x_{i}", uncertainty=0.01 * (i + 1))
+            for i in range(n_symbols)]
+
+
+def build_expression(n_symbols, depth):
+    """Sum of ``n_symbols`` lengths nested ``depth`` times in ratios, in meter"""
+    symbols = build_symbols(n_symbols)
+    expr = symbols[0]
+    for symbol in symbols[1:]:
+        expr = expr + symbol
+    for level in range(depth):
+        numerator = symbols[level % n_symbols]
+        denominator = symbols[(level + 1) % n_symbols]
+        expr = expr * numerator / denominator + numerator
+    return expr
@@ -0,0 +1,74 @@
+"""Common-subexpression elimination on the propagation formulas"""
+import numpy as np
+import sympy
+
+from ueca.compiler import compile_expr
+from ueca.symbolf import exp
+from ueca.uncertainty import (combined_standard_uncertainty, CovariancePropagation,
+                              UncertaintyPropagation)
+
+from .common import build_expression
+
+
+def build_exponential_expression(n_symbols):
+    """Lengths multiplied by one shared exponential, in meter"""
+    values = build_expression(n_symbols, 0)
+    ratio = build_expression(n_symbols, 2) / values
+    return values * exp(ratio - 1)
+
+
+class PropagationFormulaSuite:
+    params = ([2, 8], [False, True])
+    param_names = ["n_symbols", "cse"]
+
+    def setup(self, n_symbols, cse):
+        obj = build_exponential_expression(n_symbols)
+        uncertainty = combined_standard_uncertainty(obj, use_cancel=False)
+        names = sorted(uncertainty._base_symbols)
+        self.args = [sympy.Symbol(k) for k in names]
+        self.expr = uncertainty.symbol
+        self.fused_expr = [obj.symbol, uncertainty.symbol]
+        self.arrays = [np.linspace(1.0, 2.0, 100000) for _ in names]
+        self.function = compile_expr(self.args, self.expr, cse=cse)
+        self.fused_function = compile_expr(self.args, self.fused_expr, cse=cse)
+
+    def time_compile(self, n_symbols, cse):
+        sympy.lambdify(self.args, self.expr, modules="numpy", cse=cse)
+
+    def time_evaluate_uncertainty(self, n_symbols, cse):
+        self.function(*self.arrays)
+
+    def time_evaluate_value_and_uncertainty(self, n_symbols, cse):
+        self.fused_function(*self.arrays)
+
+
+class UncertaintyPropagationSuite:
+    params = [2, 8]
+    param_names = ["n_symbols"]
+
+    def setup(self, n_symbols):
+        obj = build_exponential_expression(n_symbols)
+        self.propagation = UncertaintyPropagation(obj)
+        self.values = {k: np.linspace(1.0, 2.0, 100000) for k in self.propagation.names}
+
+    def time_evaluate(self, n_symbols):
+        self.propagation.evaluate(self.values)
+
+    def time_budget(self, n_symbols):
+        self.propagation.budget(self.values)
+
+
+class CovariancePropagationSuite:
+    params = [2, 8]
+    param_names = ["n_symbols"]
+
+    def setup(self, n_symbols):
+        obj = build_exponential_expression(n_symbols)
+        self.propagation = CovariancePropagation([obj, obj * obj])
+        self.values = {k: np.linspace(1.0, 2.0, 100000) for k in self.propagation.names}
+        n = len(self.propagation.symbols)
+        self.covariance = np.full((n, n), 0.5) + 0.5 * np.eye(n)
+        self.propagation.evaluate(self.values, self.covariance)
+
+    def time_evaluate(self, n_symbols):
+        self.propagation.evaluate(self.values, self.covariance)
@@ -0,0 +1,238 @@
+"""Arithmetic, evaluation, LaTeX and uncertainty propagation hot paths"""
+import numpy as np
+
+from ueca import compiler, data, latex, symbolf
+from ueca.data import NumericData, PhysicsData
+from ueca.report import Report
+from ueca.symbolf import diff
+from ueca.table import PhysicsTable
+from ueca.uncertainty import combined_standard_uncertainty, monte_carlo_uncertainty
+from ueca.worksheet import Worksheet
+
+from .common import build_expression, build_symbols
+
+
+SIZES = ([2, 8, 32], [1, 4, 16])
+SIZE_NAMES = ["n_symbols", "depth"]
+
+
+def clear_caches():
+    """Drop every memoized compilation, derivative and LaTeX string"""
+    compiler.clear_cache()
+    data.clear_latex_cache()
+    latex.clear_cache()
+    symbolf.clear_cache()
+
+
+class NumericArithmeticSuite:
+    params = ([10, 100], ["PhysicsData", "NumericData"])
+    param_names = ["n_terms", "layout"]
+
+    def setup(self, n_terms, layout):
+        cls = {"PhysicsData": PhysicsData, "NumericData": NumericData}[layout]
+        self.lengths = [cls(1.0 + i, "meter") for i in range(n_terms)]
+        self.measurements = [cls(1.0 + i, "meter", uncertainty=0.1) for i in range(n_terms)]
+
+    def time_add(self, n_terms, layout):
+        total = self.lengths[0]
+        for length in self.lengths[1:]:
+            total = total + length
+
+    def time_mul(self, n_terms, layout):
+        total = self.lengths[0]
+        for length in self.lengths[1:]:
+            total = total * length
+
+    def time_add_with_uncertainty(self, n_terms, layout):
+        total = self.measurements[0]
+        for length in self.measurements[1:]:
+            total = total + length
+
+
+class UnitConversionSuite:
+    params = [1, 10 ** 6]
+    param_names = ["n_readings"]
+
+    def setup(self, n_readings):
+        self.lengths = PhysicsData(np.linspace(1.0, 2.0, n_readings), "km")
+        self.temperatures = PhysicsData(np.linspace(0.0, 100.0, n_readings), "degC")
+        self.gravitation = PhysicsData(6.6743e-11, "m^3/(kg*s^2)")
+
+    def time_unit_to(self, n_readings):
+        self.lengths.unit_to("m")
+
+    def time_unit_to_offset(self, n_readings):
+        self.temperatures.unit_to("K")
+
+    def time_unit_to_compound(self, n_readings):
+        self.gravitation.unit_to("N*m^2/kg^2")
+
+
+class SymbolicArithmeticSuite:
+    params = SIZES
+    param_names = SIZE_NAMES
+
+    def time_build_expression(self, n_symbols, depth):
+        build_expression(n_symbols, depth)
+
+
+class EvaluationSuite:
+    params = SIZES
+    param_names = SIZE_NAMES
+
+    def setup(self, n_symbols, depth):
+        self.expr = build_expression(n_symbols, depth)
+        self.expr.value
+        self.batch = {f"x_{i}": np.linspace(1.0, 2.0, 10000) for i in range(n_symbols)}
+
+    def time_value(self, n_symbols, depth):
+        self.expr.value
+
+    def time_value_uncached(self, n_symbols, depth):
+        clear_caches()
+        self.expr.value
+
+    def time_evaluate_batch(self, n_symbols, depth):
+        self.expr.evaluate_batch(self.batch)
+
+    def time_subs(self, n_symbols, depth):
+        self.expr.subs()
+
+
+class LatexSuite:
+    params = SIZES
+    param_names = SIZE_NAMES
+
+    def setup(self, n_symbols, depth):
+        self.expr = build_expression(n_symbols, depth)
+        clear_caches()
+
+    def time_to_latex(self, n_symbols, depth):
+        self.expr.to_latex()
+
+    def time_to_latex_uncached(self, n_symbols, depth):
+        clear_caches()
+        self.expr.to_latex()
+
+    def time_to_latex_force_value(self, n_symbols, depth):
+        self.expr.to_latex(force_value=True)
+
+    def time_to_latex_force_value_uncached(self, n_symbols, depth):
+        clear_caches()
+        self.expr.to_latex(force_value=True)
+
+
+class DiffSuite:
+    params = SIZES
+    param_names = SIZE_NAMES
+
+    def setup(self, n_symbols, depth):
+        self.symbols = build_symbols(n_symbols)
+        self.expr = build_expression(n_symbols, depth)
+        clear_caches()
+
+    def time_diff(self, n_symbols, depth):
+        diff(self.expr, self.symbols[0], 1)
+
+    def time_diff_uncached(self, n_symbols, depth):
+        clear_caches()
+        diff(self.expr, self.symbols[0], 1)
+
+
+class UncertaintySuite:
+    params = ([2, 8], [1, 4])
+    param_names = SIZE_NAMES
+
+    def setup(self, n_symbols, depth):
+        self.expr = build_expression(n_symbols, depth)
+        clear_caches()
+
+    def time_combined_standard_uncertainty(self, n_symbols, depth):
+        combined_standard_uncertainty(self.expr)
+
+    def time_combined_standard_uncertainty_uncached(self, n_symbols, depth):
+        clear_caches()
+        combined_standard_uncertainty(self.expr)
+
+    def time_combined_standard_uncertainty_relative(self, n_symbols, depth):
+        combined_standard_uncertainty(self.expr, relative=True)
+
+    def time_combined_standard_uncertainty_value(self, n_symbols, depth):
+        combined_standard_uncertainty(self.expr).value
+
+    def time_combined_standard_uncertainty_value_uncached(self, n_symbols, depth):
+        clear_caches()
+        combined_standard_uncertainty(self.expr).value
+
+
+class MonteCarloSuite:
+    params = ([2, 8], [10 ** 5, 10 ** 6])
+    param_names = ["n_symbols", "n_samples"]
+
+    def setup(self, n_symbols, n_samples):
+        self.expr = build_expression(n_symbols, 4)
+
+    def time_monte_carlo(self, n_symbols, n_samples):
+        monte_carlo_uncertainty(self.expr, n_samples=n_samples, rng=0)
+
+    def time_monte_carlo_chunked(self, n_symbols, n_samples):
+        monte_carlo_uncertainty(self.expr, n_samples=n_samples, rng=0, chunk_size=10 ** 5)
+
+    def peakmem_monte_carlo_chunked(self, n_symbols, n_samples):
+        monte_carlo_uncertainty(self.expr, n_samples=n_samples, rng=0, chunk_size=10 ** 5)
+
+
+class TableSuite:
+    params = [10 ** 3, 10 ** 5]
+    param_names = ["n_rows"]
+
+    def setup(self, n_rows):
+        self.table = PhysicsTable({"t": np.linspace(0.5, 2.0, n_rows),
+                                   "x": np.linspace(1.0, 3.0, n_rows)},
+                                  units={"t": "s", "x": "m"}, uncertainties={"x": 0.1})
+        t, x = self.table.symbols("t", "x")
+        self.expression = x / t ** 2
+
+    def time_derived_column(self, n_rows):
+        self.table["a"] = self.expression
+
+
+class ReportSuite:
+    params = [10, 100]
+    param_names = ["n_equations"]
+
+    def setup(self, n_equations):
+        self.expressions = [build_expression(4, 4) for _ in range(n_equations)]
+        self.report = Report()
+        for i, expression in enumerate(self.expressions):
+            self.report.add(f"q_{i}", expression)
+        self.report.to_latex()
+
+    def time_rebuild_one_changed(self, n_equations):
+        self.report.add("q_0", self.expressions[0] * PhysicsData(2.0, "dimensionless"))
+        self.report.to_latex()
+
+    def time_rebuild_unchanged(self, n_equations):
+        self.report.to_latex()
+
+
+class WorksheetSuite:
+    params = [10, 100]
+    param_names = ["n_quantities"]
+
+    def setup(self, n_quantities):
+        self.worksheet = Worksheet()
+        self.worksheet.set_input("x", 1.0, "meter", uncertainty=0.1)
+        for i in range(n_quantities):
+            self.worksheet.set_input(f"y_{i}", 1.0 + i, "meter", uncertainty=0.1)
+            self.worksheet.define(f"q_{i}", self.worksheet[f"y_{i}"] ** 2 / self.worksheet["x"])
+        self.worksheet.define("total", self.worksheet["q_0"] + self.worksheet["x"])
+        self.worksheet.recompute()
+
+    def time_update_one_input(self, n_quantities):
+        self.worksheet.set_input("y_0", 2.0)
+        self.worksheet.recompute()
+
+    def time_update_shared_input(self, n_quantities):
+        self.worksheet.set_input("x", 2.0)
+        self.worksheet.recompute()
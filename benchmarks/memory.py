@@ -0,0 +1,65 @@
+"""Memory held by large collections of numeric readings"""
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from ueca.data import NumericData, PhysicsData
+from ueca.io import iter_csv
+
+
+LAYOUTS = {
+    "PhysicsData": lambda i: PhysicsData(float(i), "meter"),
+    "PhysicsData with uncertainty": lambda i: PhysicsData(float(i), "meter", uncertainty=0.1),
+    "NumericData": lambda i: NumericData(float(i), "meter"),
+    "NumericData with uncertainty": lambda i: NumericData(float(i), "meter", uncertainty=0.1),
+}
+
+
+class ReadingsSuite:
+    params = (list(LAYOUTS), [10000])
+    param_names = ["layout", "n"]
+
+    def setup(self, layout, n):
+        # Build the registry and unit cache outside of the measurement
+        LAYOUTS[layout](0)
+
+    def track_bytes_per_reading(self, layout, n):
+        tracemalloc.start()
+        try:
+            readings = [LAYOUTS[layout](i) for i in range(n)]
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del readings
+        return size / n
+
+    track_bytes_per_reading.unit = "bytes"
+
+    def peakmem_readings(self, layout, n):
+        [LAYOUTS[layout](i) for i in range(n)]
+
+
+class CsvSuite:
+    params = [10 ** 4, 10 ** 5]
+    param_names = ["chunk_size"]
+
+    def setup(self, chunk_size):
+        self.path = os.path.join(tempfile.mkdtemp(), "log.csv")
+        with open(self.path, "w") as f:
+            f.write("time [s],length [mm],u_length [um]\n")
+            for i in range(10 ** 6):
+                f.write(f"{i},{1.0 + i * 1e-6},{10 + i % 7}\n")
+
+    def teardown(self, chunk_size):
+        shutil.rmtree(os.path.dirname(self.path))
+
+    def time_iter_csv(self, chunk_size):
+        for chunk in iter_csv(self.path, uncertainties={"length": "u_length"},
+                              chunk_size=chunk_size):
+            pass
+
+    def peakmem_iter_csv(self, chunk_size):
+        for chunk in iter_csv(self.path, uncertainties={"length": "u_length"},
+                              chunk_size=chunk_size):
+            pass
@@ -0,0 +1,30 @@
+"""Start-up cost of ``import ueca`` and of the first use of its lazy parts
+
+asv runs each ``timeraw_`` benchmark in a fresh interpreter.
+"""
+
+
+class ImportSuite:
+    def timeraw_import_ueca(self):
+        return "import ueca"
+
+    def timeraw_import_constants(self):
+        return "import ueca.constants"
+
+    def timeraw_import_uncertainty(self):
+        return "import ueca.uncertainty"
+
+    def timeraw_first_constant(self):
+        return "from ueca.constants import c"
+
+    def timeraw_first_numeric_physicsdata(self):
+        return """
+        from ueca.data import PhysicsData
+        PhysicsData(1.0, "meter")
+        """
+
+    def timeraw_first_symbolic_physicsdata(self):
+        return """
+        from ueca.data import PhysicsData
+        PhysicsData(1.0, "meter", symbol="x").value
+        """
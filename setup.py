@@ -19,9 +19,11 @@ setup_args = {
     "author_email": "a03ki04@gmail.com",
     "url": "https://github.com/A03ki/ueca",
     "python_requires": ">=3.6, <3.9",
-    "install_requires": ["numpy", "pint", "scipy", "sympy", "uncertainties"],
-    "extras_require": {"tests": ["pytest"]},
+    "install_requires": ["numpy", "pint", "scipy", "sympy>=1.9", "uncertainties"],
+    "extras_require": {"tests": ["pytest"], "benchmarks": ["asv"],
+                       "cli": ["pyyaml", "tomli; python_version < '3.11'"]},
     "packages": find_packages(),
+    "entry_points": {"console_scripts": ["ueca=ueca.cli:main"]},
     "include_package_data": True,
     "classifiers": [
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from ueca.cache import DiskCache, digest, get_disk_cache, LRUCache, set_disk_cache
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_get_or_create_counters():
+    cache = LRUCache(maxsize=4)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_create("key", lambda: calls.append(1) or "value") == "value"
+    assert len(calls) == 1
+    info = cache.info()
+    assert info.hits == 2
+    assert info.misses == 1
+    assert info.currsize == 1
+    cache.clear()
+    assert cache.info() == (0, 0, 4, 0)
+
+
+def test_lru_cache_resize():
+    cache = LRUCache(maxsize=None)
+    for i in range(5):
+        cache.set(i, i)
+    cache.resize(2)
+    assert len(cache) == 2
+    assert 4 in cache
+    with pytest.raises(ValueError):
+        cache.resize(-1)
+
+
+def test_disk_cache(tmp_path):
+    cache = DiskCache(tmp_path)
+    assert cache.get("a") is None
+    cache.set("a", b"1")
+    assert cache.get("a") == b"1"
+    assert DiskCache(tmp_path).get("a") == b"1"
+    assert cache.get_or_create("b", lambda: [2]) == [2]
+    assert cache.get_or_create("b", lambda: [3]) == [2]
+    info = cache.info()
+    assert (info.hits, info.misses) == (2, 2)
+    cache.clear()
+    assert cache.info().currsize == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_disk_cache_eviction(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=25)
+    for key in "abc":
+        cache.set(key, b"0123456789")
+        os.utime(tmp_path / key, (0, {"a": 1, "b": 2, "c": 3}[key]))
+    cache.set("d", b"0123456789")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["c", "d"]
+
+
+def test_disk_cache_corrupted_entry(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.set("a", b"not a pickle")
+    assert cache.get_or_create("a", lambda: 1) == 1
+    assert cache.get_or_create("a", lambda: 2) == 1
+
+
+def test_digest():
+    assert digest("a", "b") == digest("a", "b")
+    assert digest("a", "b") != digest("ab")
+    assert len(digest("a")) == 64
+
+
+def test_set_disk_cache(tmp_path):
+    try:
+        assert isinstance(set_disk_cache(tmp_path), DiskCache)
+        assert get_disk_cache().directory == str(tmp_path)
+    finally:
+        set_disk_cache(None)
+    assert get_disk_cache() is None
@@ -0,0 +1,63 @@
+import numpy as np
+import sympy
+
+from ueca import compiler
+from ueca.cache import set_disk_cache
+from ueca.data import PhysicsData
+
+
+def test_compile_expr_reuses_function():
+    compiler.clear_cache()
+    mass = PhysicsData(2, "kilogram", symbol="m")
+    velocity = PhysicsData(3, "meter / second", symbol="v")
+    energy = mass * velocity ** 2 / 2
+    assert energy.value == 9
+    assert energy.value == 9
+    assert energy.subs().value == 9
+    energy.to_latex(force_value=True)
+    info = compiler.cache_info()
+    assert info.misses == 1
+    assert info.hits == 3
+
+
+def test_compile_expr_distinct_argument_order():
+    compiler.clear_cache()
+    x = PhysicsData(2, "meter", symbol="x")
+    y = PhysicsData(5, "meter", symbol="y")
+    assert (x - y).value == -3
+    assert (y - x).value == 3
+    assert compiler.cache_info().misses == 2
+
+
+def test_compile_expr_cse():
+    compiler.clear_cache()
+    x, y = sympy.symbols("x y")
+    shared = sympy.exp(x * y)
+    exprs = [shared + x, shared * y]
+    function = compiler.compile_expr([x, y], exprs)
+    reference = compiler.compile_expr([x, y], exprs, cse=False)
+    assert function is not reference
+    values = np.linspace(0.0, 1.0, 5)
+    for result, expectation in zip(function(values, 2.0), reference(values, 2.0)):
+        np.testing.assert_allclose(result, expectation)
+
+
+def test_compile_expr_disk_cache(tmp_path, monkeypatch):
+    x, y = sympy.symbols("x y")
+    expr = [sympy.sqrt(x) * sympy.exp(y) + sympy.pi, sympy.Heaviside(x - 1)]
+    set_disk_cache(tmp_path)
+    try:
+        compiler.clear_cache()
+        expectation = compiler.compile_expr([x, y], expr)(4.0, 0.0)
+        assert len(list(tmp_path.iterdir())) == 1
+
+        def fail(*args):
+            raise AssertionError("lambdify must not run")
+
+        compiler.clear_cache()
+        monkeypatch.setattr(compiler, "_lambdify", fail)
+        function = compiler.compile_expr([x, y], expr)
+        assert function(4.0, 0.0) == expectation
+    finally:
+        set_disk_cache(None)
+        compiler.clear_cache()
@@ -1,3 +1,5 @@
+import pytest
+
 from ueca.constants import c, e, epsilon_0, g, G, h, k, m_e, m_p, m_u, mu_0, N_A, R
 
 
@@ -53,3 +55,14 @@ class TestConstants:
     def test_R(self):
         assert R.value == 8.314462618
         assert R.unit == "joule / kelvin / mole"
+
+
+def test_gas_constant_alias():
+    from ueca.constants import gas_constant
+    assert gas_constant is R
+
+
+def test_unknown_constant():
+    import ueca.constants
+    with pytest.raises(AttributeError):
+        ueca.constants.unknown_constant
@@ -1,6 +1,11 @@
+import sys
+
+import numpy as np
+import pint
+import pytest
 import sympy
 
-from ueca.data import PhysicsData, as_physicsdata, ureg
+from ueca.data import NumericData, PhysicsData, _conversion, as_physicsdata, parse_units, ureg
 
 
 class TestPhysicsData:
@@ -171,6 +176,32 @@ class TestPhysicsData:
         assert power2.unit == "kilogram * meter / second ** 2"
         assert power1.symbol == power2.symbol
         assert power1._base_symbols == power2._base_symbols
+        with pytest.raises(pint.DimensionalityError):
+            power1.unit_to("m")
+
+    def test_unit_to_array(self):
+        lengths = PhysicsData(np.array([1.0, 2.5, 4.0]), "km").unit_to("m")
+        np.testing.assert_allclose(lengths.value, [1000.0, 2500.0, 4000.0])
+        assert lengths.unit == "meter"
+
+    def test_unit_to_offset_units(self):
+        temperatures = PhysicsData(np.array([0.0, 100.0]), "degC").unit_to("K")
+        np.testing.assert_allclose(temperatures.value, [273.15, 373.15])
+        temperature = PhysicsData(68.0, "degF").unit_to("degC")
+        assert temperature.value == pytest.approx(20.0)
+        factor, offset = _conversion(parse_units("degF"), parse_units("degC"))
+        assert factor == pytest.approx(5 / 9, rel=1e-15)
+        assert offset == pytest.approx(-160 / 9, rel=1e-14)
+        assert _conversion(parse_units("dBm"), parse_units("mW")) is None
+        with pytest.raises(pint.DimensionalityError):
+            PhysicsData(20, "degC", symbol="T").unit_to("meter")
+        with pytest.raises(pint.DimensionalityError):
+            PhysicsData(20.0, "degC").unit_to("meter")
+
+    def test_unit_to_measurement(self):
+        length = PhysicsData(2.0, "m", uncertainty=0.1).unit_to("cm")
+        assert length.value.nominal_value == pytest.approx(200.0)
+        assert length.value.std_dev == pytest.approx(10.0)
 
 
 class TestPhysicsDataSymbol:
@@ -397,3 +428,162 @@ def test_as_physicsdata_except_physicsdata():
     assert isinstance(x, PhysicsData)
     assert x.value == value
     assert x.unit == unit
+
+
+class TestEvaluateBatch:
+    def test_values(self):
+        mass = PhysicsData(2.0, "kilogram", symbol="m")
+        velocity = PhysicsData(3.0, "meter / second", symbol="v")
+        energy = mass * velocity ** 2 / 2
+        masses = np.array([1.0, 2.0, 4.0])
+        velocities = np.array([2.0, 3.0, 1.0])
+        result = energy.evaluate_batch({"m": masses, "v": velocities})
+        assert result.unit == "kilogram * meter ** 2 / second ** 2"
+        np.testing.assert_allclose(result.value, masses * velocities ** 2 / 2)
+        assert result.uncertainty is None
+
+    def test_values_unit_conversion(self):
+        length = PhysicsData(1.0, "meter", symbol="l")
+        area = length * length
+        result = area.evaluate_batch({"l": ureg.Quantity(np.array([100.0, 200.0]), "cm")})
+        np.testing.assert_allclose(result.value, [1.0, 4.0])
+
+    def test_uncertainties(self):
+        mass = PhysicsData(2.0, "kilogram", symbol="m", uncertainty=0.1)
+        velocity = PhysicsData(3.0, "meter / second", symbol="v")
+        momentum = mass * velocity
+        velocities = np.array([1.0, 2.0])
+        errors = np.array([0.2, 0.4])
+        result = momentum.evaluate_batch({"v": velocities}, {"v": errors})
+        np.testing.assert_allclose(result.value, 2.0 * velocities)
+        np.testing.assert_allclose(result.uncertainty,
+                                   np.sqrt((velocities * 0.1) ** 2 + (2.0 * errors) ** 2))
+
+    def test_unknown_symbol(self):
+        length = PhysicsData(1.0, "meter", symbol="l")
+        with pytest.raises(ValueError):
+            (2 * length).evaluate_batch({"x": np.array([1.0])})
+
+    def test_numeric_mode(self):
+        with pytest.raises(ValueError):
+            PhysicsData(1.0, "meter").evaluate_batch({})
+
+
+def test_physicsdata_accepts_pint_unit():
+    length = PhysicsData(2, ureg.Unit("meter"))
+    assert length.unit == "meter"
+    area = length * length
+    assert area.unit == "meter ** 2"
+
+
+def test_parse_units_cache():
+    parse_units.cache_clear()
+    assert parse_units("kg*m/s^2") is parse_units("kg*m/s^2")
+    assert parse_units.cache_info().hits == 1
+
+
+def test_physicsdata_slots():
+    length = PhysicsData(2, "meter")
+    assert not hasattr(length, "__dict__")
+
+
+class TestNumericData:
+    def test_list_values(self):
+        a = NumericData([1, 2], "m")
+        np.testing.assert_array_equal((a + NumericData((3, 4), "m")).value, [4, 6])
+        np.testing.assert_array_equal((a * 2).value, [2, 4])
+        np.testing.assert_array_equal((2 * a).value, [2, 4])
+        np.testing.assert_array_equal(NumericData([1.0], "m", uncertainty=[0.1]).uncertainty,
+                                      [0.1])
+
+    def test_slots(self):
+        length = NumericData(2.0, "meter")
+        assert not hasattr(length, "__dict__")
+        assert sys.getsizeof(length) < sys.getsizeof(PhysicsData(2.0, "meter"))
+        assert isinstance(length, PhysicsData)
+        assert issubclass(NumericData, PhysicsData)
+        assert (length.symbol, length.left_side) == (None, "")
+        with pytest.raises(AttributeError):
+            length.symbol = "x"
+
+    def test_arithmetic(self):
+        length1 = NumericData(2.0, "meter")
+        length2 = NumericData(3.0, "meter")
+        length3 = length1 + length2
+        assert isinstance(length3, NumericData)
+        assert length3.value == 5.0
+        assert length3.unit == "meter"
+        area = length1 * length2
+        assert isinstance(area, NumericData)
+        assert area.unit == "meter ** 2"
+
+    def test_mixed_with_physicsdata(self):
+        length = NumericData(2.0, "meter")
+        time = PhysicsData(4.0, "second")
+        velocity = length / time
+        assert velocity.value == 0.5
+        assert velocity.unit == "meter / second"
+        assert as_physicsdata(length) is length
+
+    def test_mixed_with_symbolic(self):
+        length1 = PhysicsData(1.0, "meter", symbol="x")
+        length2 = NumericData(2.0, "meter")
+        length3 = length1 + length2
+        assert length3.is_symbolic()
+        assert length3.value == 3.0
+
+    def test_uncertainty(self):
+        length = NumericData(2.0, "meter", uncertainty=0.1)
+        assert length.uncertainty == 0.1
+        assert isinstance(length.data, ureg.Measurement)
+        assert length.to_latex() == r"$\left(2.00 \pm 0.10\right)\ \mathrm{m}$"
+
+    def test_add_converts_units(self):
+        length = NumericData(2.0, "meter") + NumericData(3.0, "centimeter")
+        assert length.value == pytest.approx(2.03)
+        assert length.unit == "meter"
+        length = 1.0 + NumericData(3.0, "dimensionless")
+        assert length.value == 4.0
+
+    def test_dimensionality_error(self):
+        with pytest.raises(pint.DimensionalityError):
+            NumericData(2.0, "meter") + NumericData(3.0, "second")
+        with pytest.raises(pint.DimensionalityError):
+            PhysicsData(2.0, "meter") - NumericData(3.0, "second")
+
+    def test_matches_physicsdata(self):
+        length, length_ref = NumericData(7.0, "meter"), PhysicsData(7.0, "meter")
+        time, time_ref = NumericData(2.0, "second"), PhysicsData(2.0, "second")
+        results = [length / time, length // time, 3 / time, 3 // time, 2 * length,
+                   length ** 2, 4 - length / length]
+        references = [length_ref / time_ref, length_ref // time_ref, 3 / time_ref,
+                      3 // time_ref, 2 * length_ref, length_ref ** 2,
+                      4 - length_ref / length_ref]
+        for result, reference in zip(results, references):
+            assert isinstance(result, NumericData)
+            assert result.value == reference.value
+            assert result.unit == reference.unit
+
+    def test_offset_units_fall_back_to_pint(self):
+        temperature = NumericData(3.0, "degC") + NumericData(1.0, "delta_degC")
+        assert temperature.value == 4.0
+        assert temperature.unit == "degree_Celsius"
+
+    def test_correlated_uncertainty(self):
+        length = NumericData(2.0, "meter", uncertainty=0.1)
+        assert (length - length).value.std_dev == 0
+        assert (length * length).value.std_dev == pytest.approx(0.4)
+
+    def test_unit_to(self):
+        length = NumericData(2.0, "meter").unit_to("cm")
+        assert isinstance(length, NumericData)
+        assert length.value == 200.0
+        assert length.unit == "centimeter"
+
+    def test_unit_to_keeps_uncertainty(self):
+        length = NumericData(2.0, "meter", uncertainty=0.1).unit_to("cm")
+        assert length.uncertainty == pytest.approx(10.0)
+        temperatures = NumericData(np.array([0.0, 10.0]), "degC",
+                                   uncertainty=np.array([0.5, 0.5])).unit_to("degF")
+        np.testing.assert_allclose(temperatures.value, [32.0, 50.0])
+        np.testing.assert_allclose(temperatures.uncertainty, [0.9, 0.9])
@@ -0,0 +1,50 @@
+from ueca.data import PhysicsData
+from ueca.environment import SymbolEnvironment
+
+
+def test_merge_later_parent_wins():
+    env1 = SymbolEnvironment({"x": 1, "y": 2})
+    env2 = SymbolEnvironment({"y": 3, "z": 4})
+    merged = env1.merge(env2)
+    assert merged == {"x": 1, "y": 3, "z": 4}
+    assert env1 == {"x": 1, "y": 2}
+    assert env2 == {"y": 3, "z": 4}
+
+
+def test_merge_empty_shares_environment():
+    env = SymbolEnvironment({"x": 1})
+    empty = SymbolEnvironment.coerce(None)
+    assert env.merge(empty) is env
+    assert empty.merge(env) is env
+    assert env.merge(env) is env
+
+
+def test_coerce_copies_mapping():
+    source = {"x": 1}
+    env = SymbolEnvironment.coerce(source)
+    source["y"] = 2
+    assert env == {"x": 1}
+    assert SymbolEnvironment.coerce(env) is env
+
+
+def test_restrict():
+    env = SymbolEnvironment({"x": 1}).merge(SymbolEnvironment({"y": 2}))
+    assert env.restrict({"x", "y"}) is env
+    assert env.restrict({"x"}) == {"x": 1}
+
+
+def test_deep_chain():
+    total = PhysicsData(0, "meter", symbol="x_0")
+    for i in range(1, 300):
+        total = total + PhysicsData(i, "meter", symbol=f"x_{i}")
+    assert len(total._base_symbols) == 300
+    assert total.value == sum(range(300))
+
+
+def test_physicsdata_drops_cancelled_symbols():
+    length1 = PhysicsData(1, "meter", symbol="x")
+    length2 = PhysicsData(2, "meter", symbol="y")
+    length3 = length1 + length2 - length1
+    assert dict(length3._base_symbols).keys() == {"y"}
+    assert length3.value == 2
+    assert len(length1._base_symbols) == 1
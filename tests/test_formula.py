@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from ueca.data import PhysicsData
+from ueca.formula import parse_formula
+
+
+def test_parse_formula():
+    x = PhysicsData(2.0, "m", symbol="x")
+    t = PhysicsData(4.0, "s", symbol="t")
+    data = parse_formula("x**2/t + x*sqrt(x**2)/t*exp(-t/t) + 3/2*x**2/t", {"x": x, "t": t})
+    assert data.unit == "meter ** 2 / second"
+    assert data.value == pytest.approx(1.0 + 1.0 / np.e + 1.5)
+    assert parse_formula("E*2", {"E": x}).value == 4.0
+    constant = parse_formula("3/2", {"x": x})
+    assert (constant.is_symbolic(), constant.unit) == (True, "dimensionless")
+    with pytest.raises(ValueError):
+        parse_formula("x + y", {"x": x})
+    with pytest.raises(TypeError):
+        parse_formula("x + t", {"x": x, "t": t})
+    with pytest.raises(ValueError):
+        parse_formula("x**t", {"x": x, "t": t})
+
+
+def test_parse_formula_refuses_code():
+    x = PhysicsData(2.0, "m", symbol="x")
+    for text in ["x.__class__", "__import__('os').getcwd()", "x[0]", "'x'", "lambda: x",
+                 "foo(x)", "exp(x=x)", "x if x else x", "1j*x"]:
+        with pytest.raises(ValueError):
+            parse_formula(text, {"x": x})
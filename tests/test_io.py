@@ -0,0 +1,76 @@
+import io
+
+import numpy as np
+import pytest
+
+from ueca.data import NumericData
+from ueca.io import iter_csv, parse_header, read_csv
+
+
+LOG = """# logger v1
+time [s],length [mm],u_length [um],temperature [degC]
+0,1.0,10,20.0
+1,2.0,20,21.5
+
+2,3.0,30,23.0
+"""
+
+
+def test_parse_header():
+    assert parse_header("length [mm]") == ("length", "mm")
+    assert parse_header(" time ") == ("time", None)
+    assert parse_header("ratio []") == ("ratio", None)
+
+
+def test_read_csv(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text(LOG)
+    table = read_csv(path, uncertainties={"length": "u_length", "temperature": 0.1})
+    assert list(table) == ["time", "length", "temperature"]
+    assert isinstance(table["length"], NumericData)
+    np.testing.assert_allclose(table["time"].value, [0.0, 1.0, 2.0])
+    assert table["length"].unit == "millimeter"
+    np.testing.assert_allclose(table["length"].uncertainty, [0.01, 0.02, 0.03])
+    assert table["temperature"].unit == "degree_Celsius"
+    assert table["temperature"].uncertainty == 0.1
+    assert table["time"].uncertainty is None
+
+
+def test_iter_csv_chunks():
+    chunks = list(iter_csv(io.StringIO(LOG), uncertainties={"length": "u_length"},
+                           chunk_size=2))
+    assert [len(chunk["time"].value) for chunk in chunks] == [2, 1]
+    np.testing.assert_allclose(chunks[1]["length"].uncertainty, [0.03])
+
+
+def test_iter_csv_units_and_columns():
+    chunks = list(iter_csv(io.StringIO("a,b\n1,2\n3,4\n"), units={"a": "m"}, columns=["a"]))
+    assert list(chunks[0]) == ["a"]
+    assert chunks[0]["a"].unit == "meter"
+    np.testing.assert_allclose(chunks[0]["a"].value, [1.0, 3.0])
+
+
+def test_iter_csv_missing_column():
+    with pytest.raises(ValueError):
+        list(iter_csv(io.StringIO(LOG), uncertainties={"mass": "u_mass"}))
+    with pytest.raises(ValueError):
+        list(iter_csv(io.StringIO(LOG), columns=["mass"]))
+
+
+def test_read_csv_without_rows():
+    with pytest.raises(ValueError):
+        read_csv(io.StringIO("time [s]\n"))
+
+
+def test_iter_csv_quoted_fields():
+    text = ('# logger v1\nnote,"length [mm]",u [mm]\n"first, ""a""",1.0,0.1\n'
+            '"two\n# lines",2.0,0.2\n# skipped,3.0,0.3\n')
+    table = read_csv(io.StringIO(text), units={"note": "dimensionless"},
+                     uncertainties={"length": "u"}, columns=["length"])
+    np.testing.assert_allclose(table["length"].value, [1.0, 2.0])
+    np.testing.assert_allclose(table["length"].uncertainty, [0.1, 0.2])
+
+
+def test_read_csv_non_affine_uncertainty_unit():
+    table = read_csv(io.StringIO("P [dBm],u_P [mW]\n1.0,10.0\n"), uncertainties={"P": "u_P"})
+    np.testing.assert_allclose(table["P"].uncertainty, [10.0])
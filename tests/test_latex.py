@@ -1,6 +1,11 @@
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import sympy
 
-from ueca.latex import translate_space_latex
+from ueca.data import clear_latex_cache, latex_cache_info, PhysicsData
+from ueca.latex import cache_info, clear_cache, latex, translate_space_latex
 
 
 def test_translate_space_latex():
@@ -10,3 +15,68 @@ def test_translate_space_latex():
 
     with translate_space_latex():
         assert sympy.latex(delta_lambda) == r"\Delta \lambda"
+
+
+def test_latex_does_not_patch_sympy():
+    delta_lambda = sympy.Symbol("Delta lambda")
+    assert latex(delta_lambda) == r"\Delta \lambda"
+    assert sympy.latex(delta_lambda) == "Delta lambda"
+
+
+def test_latex_cache():
+    clear_cache()
+    expr = sympy.Symbol("Delta x") ** 2
+    assert latex(expr) == latex(expr)
+    assert latex(expr, fold_short_frac=True) == r"\Delta x^{2}"
+    info = cache_info()
+    assert info.hits == 1
+    assert info.misses == 2
+
+
+def test_symbolic_latex_cache():
+    clear_latex_cache()
+    length = PhysicsData(1.0, "meter", symbol="x") ** 2
+    assert length._repr_latex_() == length._repr_latex_()
+    assert (latex_cache_info().hits, latex_cache_info().misses) == (1, 1)
+    clear_latex_cache()
+    assert latex_cache_info().currsize == 0
+
+
+def test_repr_latex_in_threads():
+    length = PhysicsData(82.39, "meter", symbol="Delta lambda_i")
+    symbols = [sympy.Symbol(f"Delta theta_{i}") for i in range(200)]
+
+    def render(i):
+        if i % 2:
+            return sympy.latex(symbols[i])
+        return (length * i)._repr_latex_()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(render, range(200)))
+
+    for i, text in enumerate(results):
+        if i % 2:
+            assert text == f"Delta theta_{{{i}}}"
+        elif i == 0:
+            assert text == r"0\ \mathrm{m}"
+        else:
+            assert text == rf"{i} \Delta \lambda_{{i}}\ \mathrm{{m}}"
+
+
+def test_repr_latex_first_use_in_threads():
+    # A fresh interpreter, so that ueca.latex is first imported by the threads themselves
+    code = ("import threading\n"
+            "from ueca.data import PhysicsData\n"
+            "barrier = threading.Barrier(20)\n"
+            "results = []\n"
+            "def render(i):\n"
+            "    data = PhysicsData(i, 'meter', symbol=f'Delta x_{i}')\n"
+            "    barrier.wait()\n"
+            "    results.append(data._repr_latex_())\n"
+            "threads = [threading.Thread(target=render, args=(i,)) for i in range(20)]\n"
+            "for t in threads: t.start()\n"
+            "for t in threads: t.join()\n"
+            "assert sorted(results) == sorted(f'\\\\Delta x_{{{i}}}\\\\ \\\\mathrm{{m}}'\n"
+            "                                 for i in range(20)), results\n")
+    for _ in range(5):
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import pytest
+
+from ueca.lazy import lazy_import
+
+
+def _run(code):
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_import_ueca_is_lazy():
+    _run("import sys, ueca, ueca.constants, ueca.uncertainty\n"
+         "from ueca import data\n"
+         "assert data._registry is None\n"
+         "assert 'scipy.constants' not in sys.modules\n"
+         "assert 'sympy.core' not in sys.modules\n")
+
+
+def test_numeric_physicsdata_does_not_load_sympy():
+    _run("import sys\n"
+         "from ueca.data import PhysicsData\n"
+         "assert (PhysicsData(2, 'meter') * 3).value == 6\n"
+         "assert 'sympy.core' not in sys.modules\n")
+
+
+def test_package_modules_are_attributes_of_ueca():
+    _run("import ueca.latex\n"
+         "assert callable(ueca.latex.latex)\n")
+    _run("import ueca.data, ueca.latex, ueca.report\n"
+         "assert callable(ueca.latex.latex)\n")
+
+
+def test_lazy_import_first_use_from_threads():
+    _run("import sys, threading\n"
+         "from ueca.lazy import lazy_import\n"
+         "fractions = lazy_import('fractions')\n"
+         "assert 'fractions' not in sys.modules\n"
+         "results = []\n"
+         "threads = [threading.Thread(target=lambda: results.append(fractions.Fraction(1, 2)))\n"
+         "           for _ in range(20)]\n"
+         "for t in threads: t.start()\n"
+         "for t in threads: t.join()\n"
+         "assert len(results) == 20\n"
+         "assert fractions.Fraction is sys.modules['fractions'].Fraction\n")
+
+
+def test_lazy_import_missing_module():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("ueca_missing_module")
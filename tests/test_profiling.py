@@ -0,0 +1,73 @@
+import pytest
+
+from ueca import profiling
+from ueca.data import PhysicsData
+from ueca.symbolf import diff
+
+
+@pytest.fixture(autouse=True)
+def restore():
+    enabled = profiling.is_enabled()
+    yield
+    if enabled:
+        profiling.enable()
+    else:
+        profiling.disable()
+    profiling.reset()
+
+
+def test_timed():
+    @profiling.timed("test.square")
+    def square(x):
+        return x ** 2
+
+    profiling.disable()
+    profiling.reset()
+    assert square(3) == 9
+    assert profiling.stats() == {}
+
+    profiling.enable()
+    square(2)
+    square(4)
+    stats = profiling.stats()["test.square"]
+    assert stats.calls == 2
+    assert stats.total >= 0
+
+
+def test_profile_records_library_phases():
+    profiling.disable()
+    with profiling.profile():
+        x = PhysicsData(2.0, "meter", symbol="x_profile")
+        derivative = diff(x ** 3, x, 1)
+        derivative.value
+    assert not profiling.is_enabled()
+    stats = profiling.stats()
+    assert stats["symbolf.diff"].calls == 1
+    assert stats["data.value"].calls == 1
+    assert stats["data.operators"].calls == 1
+    assert "data.value" in profiling.report()
+
+
+def test_phase_and_hooks():
+    records = []
+
+    def hook(phase, seconds):
+        records.append(phase)
+
+    profiling.add_hook(hook)
+    try:
+        with profiling.profile():
+            with profiling.phase("test.block"):
+                pass
+    finally:
+        profiling.remove_hook(hook)
+    assert records == ["test.block"]
+    assert profiling.stats()["test.block"].calls == 1
+
+
+def test_dump(capsys):
+    with profiling.profile():
+        with profiling.phase("test.block"):
+            pass
+    profiling.dump()
+    assert "test.block" in capsys.readouterr().err
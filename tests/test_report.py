@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ueca.data import PhysicsData
+from ueca.report import Report
+
+
+def make_report(length=2.0):
+    x = PhysicsData(length, "meter", symbol="x")
+    t = PhysicsData(4.0, "second", symbol="t")
+    report = Report()
+    report.add("v", x / t)
+    report.add("v_value", x / t, force_value=True)
+    report.add("g", PhysicsData(9.8, "m/s^2", left_side="g_0"))
+    return report
+
+
+def test_to_latex():
+    text = make_report().to_latex()
+    assert text.startswith("\\documentclass{article}")
+    assert "% v\n\\begin{equation*}\n    v = \\frac{x}{t}" in text
+    assert "v_{value} = 0.5\\ " in text
+    assert "g_0 = 9.8\\ " in text
+    assert text.endswith("\\end{document}\n")
+
+
+def test_only_changed_fragments_are_rendered():
+    report = make_report()
+    report.fragments()
+    assert report.cache_info().misses == 3
+
+    x = PhysicsData(6.0, "meter", symbol="x")
+    t = PhysicsData(4.0, "second", symbol="t")
+    report.add("v", x / t)
+    report.add("v_value", x / t, force_value=True)
+    fragments = report.fragments()
+    info = report.cache_info()
+    assert (info.hits, info.misses) == (2, 4)
+    assert fragments["v_value"].startswith("v_{value} = 1.5")
+
+
+def test_cache_file(tmp_path):
+    cache_file = tmp_path / "report.json"
+    report = make_report()
+    report.cache_file = cache_file
+    report.write(tmp_path / "report.tex")
+    assert (tmp_path / "report.tex").read_text() == report.to_latex()
+
+    rebuilt = Report(cache_file=cache_file)
+    for name, entry in make_report()._entries.items():
+        rebuilt.add(name, *entry)
+    rebuilt.fragments()
+    assert rebuilt.cache_info().misses == 0
+
+
+def test_parallel():
+    report = make_report()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fragments = report.fragments(executor=executor)
+    assert fragments == make_report().fragments()
+    assert make_report().fragments(parallel=True) == fragments
+
+
+def test_remove():
+    report = make_report()
+    report.remove("g")
+    assert report.names == ("v", "v_value")
+    with pytest.raises(TypeError):
+        report.add("a", 1.0)
+
+
+def test_left_side():
+    report = Report(cache_size=2)
+    g = PhysicsData(9.8, "m/s^2", left_side="g_0")
+    report.add("g", g, left_side="g")
+    report.add("h", g)
+    report.add("k", PhysicsData(1.0, "m"), left_side="")
+    fragments = report.fragments()
+    assert fragments["g"].startswith("g = 9.8")
+    assert fragments["h"].startswith("g_0 = 9.8")
+    assert fragments["k"].startswith("1.0")
+    assert report.cache_info().currsize == 2
+
+
+def test_entries_sharing_data():
+    x = PhysicsData(2.0, "meter", symbol="x")
+    report = Report()
+    report.add("a", x * 2)
+    report.add("b", x * 2)
+    report.add("c", PhysicsData(1.0, "m"))
+    report.add("d", PhysicsData(1.0, "m"))
+    fragments = report.fragments()
+    assert fragments["a"].startswith("a = 2 x")
+    assert fragments["b"].startswith("b = 2 x")
+    assert fragments["c"].startswith("c = 1.0")
+    assert fragments["d"].startswith("d = 1.0")
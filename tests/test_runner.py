@@ -0,0 +1,129 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from ueca.cli import main
+from ueca.data import PhysicsData
+from ueca.runner import load_spec, normalize_spec, run
+
+
+SPEC = {
+    "output": "out",
+    "formats": ["csv", "json", "latex"],
+    "inputs": {"offset": {"value": 1.0, "unit": "cm", "uncertainty": 0.1}},
+    "quantities": {"g": "4*pi**2*(L + offset)/T**2"},
+    "uncertainties": {"T": "u_T"},
+    "experiments": [
+        {"name": "table", "data": "table.csv"},
+        {"name": "scalar",
+         "inputs": {"L": {"value": 99.0, "unit": "cm", "uncertainty": 0.2},
+                    "T": {"value": 2.0, "unit": "s", "uncertainty": 0.01}}},
+    ],
+}
+
+
+def write_spec(tmp_path, name="spec.json"):
+    (tmp_path / "table.csv").write_text("L [cm],T [s],u_T [s]\n99,2.0,0.01\n24,1.0,0.01\n"
+                                        "49,1.5,0.02\n")
+    path = tmp_path / name
+    path.write_text(json.dumps(SPEC))
+    return path
+
+
+def test_run(tmp_path):
+    spec = load_spec(write_spec(tmp_path))
+    results = run(spec, workers=1)
+    assert [(r.name, r.rows, r.skipped) for r in results] == [("table", 3, False),
+                                                              ("scalar", None, False)]
+    output = tmp_path / "out"
+
+    table = np.loadtxt(output / "table.csv", delimiter=",", skiprows=1)
+    expectation = 4 * np.pi ** 2 * np.array([100.0, 25.0, 50.0]) / np.array([2.0, 1.0, 1.5]) ** 2
+    np.testing.assert_allclose(table[:, 0], expectation)
+    relative = np.sqrt((0.1 / np.array([100.0, 25.0, 50.0])) ** 2
+                       + (2 * np.array([0.01, 0.01, 0.02]) / np.array([2.0, 1.0, 1.5])) ** 2)
+    np.testing.assert_allclose(table[:, 1], expectation * relative)
+
+    summary = json.loads((output / "scalar.json").read_text())
+    g = summary["quantities"]["g"]
+    assert g["unit"] == "centimeter / second ** 2"
+    assert g["value"] == pytest.approx(np.pi ** 2 * 100)
+    assert g["uncertainty"] == pytest.approx(np.pi ** 2 * 100 * np.sqrt(
+        (np.hypot(0.2, 0.1) / 100) ** 2 + 0.01 ** 2))
+    assert json.loads((output / "table.json").read_text())["quantities"]["g"]["mean"] \
+        == pytest.approx(expectation.mean())
+    assert "\\begin{equation*}" in (output / "scalar.tex").read_text()
+
+
+def test_run_resumes(tmp_path):
+    spec = load_spec(write_spec(tmp_path))
+    run(spec, workers=1)
+    assert all(r.skipped for r in run(spec, workers=1))
+    assert not any(r.skipped for r in run(spec, workers=1, force=True))
+
+    (tmp_path / "out" / "table.csv").unlink()
+    assert [r.skipped for r in run(spec, workers=1)] == [False, True]
+
+
+def test_run_executor(tmp_path):
+    spec = load_spec(write_spec(tmp_path))
+    progress = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        run(spec, executor=executor, progress=lambda done, total, r: progress.append(total))
+    assert progress == [2, 2]
+
+
+def test_load_spec_formats(tmp_path):
+    pytest.importorskip("yaml")
+    import yaml
+    path = tmp_path / "spec.yaml"
+    path.write_text(yaml.safe_dump(SPEC))
+    assert load_spec(path)["experiments"][0]["data"] == str(tmp_path / "table.csv")
+    with pytest.raises(ValueError):
+        load_spec(tmp_path / "spec.ini")
+
+
+def test_normalize_spec_errors():
+    with pytest.raises(ValueError):
+        normalize_spec({"experiments": []})
+    with pytest.raises(ValueError):
+        normalize_spec({**SPEC, "formats": ["xlsx"]})
+    with pytest.raises(ValueError):
+        normalize_spec({**SPEC, "experiments": [{"name": "a"}, {"name": "a"}]})
+
+
+def test_cli(tmp_path, capsys):
+    path = write_spec(tmp_path)
+    assert main(["run", str(path), "-j", "1", "-f", "json", "-o", str(tmp_path / "cli")]) == 0
+    assert sorted(p.name for p in (tmp_path / "cli").iterdir()) == ["scalar.json", "table.json"]
+    assert "[2/2] scalar: done" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(["run", str(tmp_path / "missing.json")])
+
+
+def test_cli_reports_errors_per_experiment(tmp_path, capsys):
+    spec = dict(SPEC, experiments=SPEC["experiments"] + [
+        {"name": "units", "inputs": {"L": {"value": 1.0, "unit": "kg"}, "T": 1.0}},
+        {"name": "missing", "data": "missing.csv"},
+        {"name": "constant", "inputs": SPEC["experiments"][1]["inputs"],
+         "quantities": {"y": "2"}}])
+    write_spec(tmp_path).write_text(json.dumps(spec))
+    assert main(["run", str(tmp_path / "spec.json"), "-j", "1", "-q", "-f", "json"]) == 1
+    err = capsys.readouterr().err
+    assert "units: error:" in err and "missing: error:" in err
+    assert "constant: error: The quantity doesn't depend on any input: 'y'" in err
+    assert "scalar: done" not in err
+    assert (tmp_path / "out" / "scalar.json").exists()
+
+    with pytest.raises(TypeError):
+        run(load_spec(tmp_path / "spec.json"), workers=1)
+
+
+def test_cli_invalid_yaml(tmp_path, capsys):
+    pytest.importorskip("yaml")
+    (tmp_path / "spec.yaml").write_text("experiments: [\n")
+    with pytest.raises(SystemExit):
+        main(["run", str(tmp_path / "spec.yaml")])
+    assert "Invalid YAML spec" in capsys.readouterr().err
@@ -0,0 +1,97 @@
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from ueca.data import NumericData, PhysicsData
+from ueca.serialize import dumps, FORMAT_VERSION, from_dict, loads, to_dict
+from ueca.symbolf import exp
+
+
+def round_trips(obj):
+    return [pickle.loads(pickle.dumps(obj)), loads(dumps(obj))]
+
+
+def double(obj):
+    return obj * 2
+
+
+def test_numeric():
+    length = PhysicsData(2.0, "meter", uncertainty=0.1, left_side="l")
+    for restored in round_trips(length):
+        assert type(restored) is PhysicsData
+        assert restored.unit == "meter"
+        assert restored.value.nominal_value == 2.0
+        assert restored.uncertainty == 0.1
+        assert restored.left_side == "l"
+        assert (restored + length).value.nominal_value == 4.0
+
+
+def test_array():
+    lengths = PhysicsData(np.arange(3.0), "meter", uncertainty=np.full(3, 0.1))
+    for restored in round_trips(lengths):
+        np.testing.assert_array_equal(restored.value, [0.0, 1.0, 2.0])
+        np.testing.assert_array_equal(restored.uncertainty, [0.1, 0.1, 0.1])
+        np.testing.assert_array_equal((restored + lengths).value, [0.0, 2.0, 4.0])
+
+
+def test_symbolic():
+    x = PhysicsData(2.0, "meter", symbol="x", uncertainty=0.1)
+    t = PhysicsData(3.0, "second", symbol="Delta t")
+    acceleration = exp(x / x) * x / t ** 2
+    for restored in round_trips(acceleration):
+        assert restored.symbol == acceleration.symbol
+        assert restored.unit == acceleration.unit
+        assert dict(restored._base_symbols).keys() == {"x", "Delta t"}
+        assert restored.value == pytest.approx(acceleration.value)
+        assert (restored * t).unit == "meter / second"
+
+
+def test_numeric_data():
+    length = NumericData(2.0, "meter", uncertainty=0.1)
+    for restored in round_trips(length):
+        assert type(restored) is NumericData
+        assert restored.value.nominal_value == 2.0
+        assert restored.uncertainty == 0.1
+        assert (restored + length).unit == "meter"
+
+
+def test_json_format():
+    state = json.loads(dumps(PhysicsData(np.arange(2.0), "m", symbol="x")))
+    assert state["version"] == FORMAT_VERSION
+    assert state["symbol"] == {"srepr": "Symbol('x')"}
+    assert state["base_symbols"]["x"][0]["dtype"] == "<f8"
+    assert state["base_symbols"]["x"][2] == "meter"
+
+
+def test_unsupported_version():
+    state = to_dict(PhysicsData(1.0, "m"))
+    state["version"] = FORMAT_VERSION + 1
+    with pytest.raises(ValueError):
+        from_dict(state)
+
+
+def test_process_pool():
+    data = [PhysicsData(1.0, "m", uncertainty=0.1), PhysicsData(2.0, "m", symbol="x"),
+            NumericData(3.0, "s")]
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        results = list(executor.map(double, data))
+    assert [r.unit for r in results] == ["meter", "meter", "second"]
+    assert results[1].symbol == 2 * data[1].symbol
+    assert results[2].value == 6.0
+
+
+def test_srepr_is_not_evaluated():
+    state = to_dict(PhysicsData(2.0, "m", symbol="x"))
+    for text in ["__import__('os').system('true')", "Symbol('x').__class__",
+                 "Function('f')(Symbol('x'))", "Symbol(*'x')", "Symbol("]:
+        state["symbol"] = {"srepr": text}
+        with pytest.raises(ValueError):
+            from_dict(state)
+
+    state["symbol"] = {"srepr": "Mul(Float('2.5', precision=53), Pow(Symbol('x', positive=True),"
+                                " Rational(1, 2)), sin(pi), Derivative(Symbol('x'), Tuple("
+                                "Symbol('x'), Integer(1))))"}
+    assert from_dict(state).symbol == 0
@@ -1,9 +1,10 @@
 import pytest
 
+from ueca.cache import get_disk_cache, set_disk_cache
 from ueca.data import PhysicsData
 from ueca.symbolf import (physicsdata_symbolic_exception,
                           as_symbolic_physicsdata_and_dimensionless_exception,
-                          cancel, diff,
+                          cache_info, cancel, clear_cache, diff, set_cache_limit,
                           Rational, exp, log, ln, sqrt, sin, cos, tan, asin, acos, atan,
                           sinh, cosh, tanh, asinh, acosh, atanh)
 
@@ -340,3 +341,58 @@ def test_atanh():
     assert length2._base_symbols == length1._base_symbols
     with pytest.raises(ValueError):
         atanh(PhysicsData(1, "meter", symbol="x"))
+
+
+def test_diff_by_symbol_name():
+    length = PhysicsData(3, "meter", symbol="x")
+    area = length * length
+    value = diff(area, "x", 1)
+    assert str(value.symbol) == "2*x"
+    assert value.unit == "meter"
+    assert value.value == 6
+
+
+def test_diff_and_cancel_cache():
+    clear_cache()
+    length1 = PhysicsData(2, "meter", symbol="x")
+    length2 = PhysicsData(3, "meter", symbol="y")
+    area = length1 * length2 / (length1 + length2) * (length1 + length2)
+    for _ in range(3):
+        value = diff(area, length1, 1)
+        cancel(area)
+    assert value.value == 3
+    assert value.unit == "meter"
+    info = cache_info()
+    assert info["diff"].misses == 1
+    assert info["diff"].hits == 2
+    assert info["cancel"].misses == 1
+    assert info["cancel"].hits == 2
+    assert info["diff_units"].hits == 2
+
+
+def test_set_cache_limit():
+    clear_cache()
+    set_cache_limit(1)
+    try:
+        length = PhysicsData(2, "meter", symbol="x")
+        diff(length ** 2, length, 1)
+        diff(length ** 3, length, 1)
+        assert cache_info()["diff"].currsize == 1
+    finally:
+        set_cache_limit(1024)
+
+
+def test_diff_and_cancel_disk_cache(tmp_path):
+    set_disk_cache(tmp_path)
+    try:
+        clear_cache()
+        length1 = PhysicsData(2, "meter", symbol="x")
+        length2 = PhysicsData(3, "meter", symbol="y")
+        area = length1 * length2 / (length1 + length2) * (length1 + length2)
+        derivative = cancel(diff(area, length1, 1))
+        clear_cache()
+        assert cancel(diff(area, length1, 1)).symbol == derivative.symbol
+        assert get_disk_cache().info().hits == 2
+    finally:
+        set_disk_cache(None)
+        clear_cache()
@@ -0,0 +1,86 @@
+import io
+
+import numpy as np
+import pytest
+
+from ueca.data import NumericData, PhysicsData
+from ueca.symbolf import exp
+from ueca.table import PhysicsTable
+
+
+def make_table():
+    return PhysicsTable({"t": [0.5, 1.0, 2.0], "x": [1.0, 2.0, 3.0]},
+                        units={"t": "s", "x": "m"}, uncertainties={"x": [0.1, 0.1, 0.2]})
+
+
+def test_columns():
+    table = make_table()
+    assert table.columns == ("t", "x")
+    assert len(table) == 3
+    assert "x" in table
+    x = table["x"]
+    assert isinstance(x, NumericData)
+    assert x.unit == "meter"
+    np.testing.assert_allclose(x.value, [1.0, 2.0, 3.0])
+    np.testing.assert_allclose(x.uncertainty, [0.1, 0.1, 0.2])
+    assert table["t"].uncertainty is None
+
+
+def test_derived_column():
+    table = make_table()
+    t, x = table.symbols("t", "x")
+    table["v"] = x / t ** 2 * exp(t / t)
+    assert table["v"].unit == "meter / second ** 2"
+    values = np.array([1.0, 2.0, 3.0]) / np.array([0.5, 1.0, 2.0]) ** 2 * np.e
+    np.testing.assert_allclose(table["v"].value, values)
+    np.testing.assert_allclose(table["v"].uncertainty,
+                               values * np.array([0.1, 0.1, 0.2]) / np.array([1.0, 2.0, 3.0]))
+
+
+def test_derived_column_converts_units():
+    table = PhysicsTable({"x": [1.0, 2.0]}, units={"x": "km"}, uncertainties={"x": 0.01})
+    x = PhysicsData(1.0, "m", symbol="x")
+    table["y"] = x * 2
+    assert table["y"].unit == "meter"
+    np.testing.assert_allclose(table["y"].value, [2000.0, 4000.0])
+    np.testing.assert_allclose(table["y"].uncertainty, [20.0, 20.0])
+
+
+def test_constant_column():
+    table = make_table()
+    table["c"] = PhysicsData(3.0, "m", uncertainty=0.1)
+    np.testing.assert_allclose(table["c"].value, [3.0, 3.0, 3.0])
+    np.testing.assert_allclose(table["c"].uncertainty, [0.1, 0.1, 0.1])
+
+
+def test_length_mismatch():
+    table = make_table()
+    with pytest.raises(ValueError):
+        table["y"] = NumericData(np.array([1.0, 2.0]), "m")
+
+
+def test_missing_column():
+    table = make_table()
+    with pytest.raises(ValueError):
+        table.symbol("y")
+    with pytest.raises(KeyError):
+        table["y"]
+    with pytest.raises(ValueError):
+        PhysicsTable({"x": [1.0]}, units={"y": "m"})
+
+
+def test_from_csv():
+    table = PhysicsTable.from_csv(io.StringIO("t [s],x [m],u [m]\n0,1,0.1\n1,2,0.1\n"),
+                                  uncertainties={"x": "u"})
+    assert table.columns == ("t", "x")
+    np.testing.assert_allclose(table["x"].uncertainty, [0.1, 0.1])
+
+
+def test_to_latex():
+    table = make_table()
+    text = table.to_latex()
+    assert text.startswith("\\begin{tabular}{cc}")
+    assert r"$t$ / $\mathrm{s}$ & $x$ / $\mathrm{m}$ \\" in text
+    assert r"$0.5$ & $1.00 \pm 0.10$ \\" in text
+    assert text.endswith("\\end{tabular}")
+    assert table.to_latex(columns=["x"]).startswith("\\begin{tabular}{c}")
@@ -1,9 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 
 from ueca.data import PhysicsData
-from ueca.symbolf import Rational
-from ueca.uncertainty import combined_standard_uncertainty
+from ueca.symbolf import exp, Rational
+from ueca.uncertainty import (_broadcast_shape, combined_standard_uncertainty,
+                              CovariancePropagation, default_max_workers, monte_carlo_uncertainty,
+                              uncertainty_budget, UncertaintyPropagation)
 
 
 def test_combined_standard_uncertainty_calculation():
@@ -27,3 +31,241 @@ def test_combined_standard_uncertainty_calculation():
                           / (outer_diameter.value ** 2 + inner_diameter.value ** 2) ** 2)
     assert pytest.approx(delta_I_relative.value) == expectation
     assert delta_I_relative.unit == "dimensionless"
+
+
+class TestUncertaintyPropagation:
+    def setup_method(self):
+        self.mass = PhysicsData(2.5, "kilogram", symbol="M", uncertainty=1.3)
+        self.outer_diameter = PhysicsData(3.1, "meter", symbol="D_1", uncertainty=0.81)
+        self.inner_diameter = PhysicsData(4.2, "meter", symbol="D_2", uncertainty=1.1)
+        self.moment_of_inertia = Rational(1, 8) * self.mass * (self.outer_diameter ** 2
+                                                               + self.inner_diameter ** 2)
+
+    def test_matches_combined_standard_uncertainty(self):
+        propagation = UncertaintyPropagation(self.moment_of_inertia)
+        assert propagation.symbols == ("D_1", "D_2", "M")
+        value, delta_I = propagation.evaluate()
+        assert value.value == pytest.approx(self.moment_of_inertia.value)
+        assert delta_I.unit == "kilogram * meter ** 2"
+        assert delta_I.value == pytest.approx(
+            combined_standard_uncertainty(self.moment_of_inertia).value)
+        _, delta_I_relative = propagation.evaluate(relative=True)
+        assert delta_I_relative.unit == "dimensionless"
+        assert delta_I_relative.value == pytest.approx(
+            combined_standard_uncertainty(self.moment_of_inertia, relative=True).value)
+
+    def test_evaluate_arrays(self):
+        propagation = UncertaintyPropagation(self.moment_of_inertia)
+        masses = np.array([1.0, 2.0, 3.0])
+        errors = np.array([0.1, 0.2, 0.3])
+        value, delta_I = propagation.evaluate({"M": masses}, {"M": errors})
+        squares = 3.1 ** 2 + 4.2 ** 2
+        np.testing.assert_allclose(value.value, masses * squares / 8)
+        expectation = np.sqrt((errors * squares / 8) ** 2
+                              + (masses * 3.1 * 0.81 / 4) ** 2
+                              + (masses * 4.2 * 1.1 / 4) ** 2)
+        np.testing.assert_allclose(delta_I.value, expectation)
+
+    def test_selected_symbols(self):
+        propagation = UncertaintyPropagation(self.moment_of_inertia, symbols=["M"])
+        _, delta_I = propagation.evaluate()
+        assert delta_I.value == pytest.approx(1.3 * (3.1 ** 2 + 4.2 ** 2) / 8)
+        with pytest.raises(ValueError):
+            propagation.evaluate(uncertainties={"D_1": 0.1})
+
+    def test_exceptions(self):
+        with pytest.raises(TypeError):
+            UncertaintyPropagation(1.0)
+        with pytest.raises(ValueError):
+            UncertaintyPropagation(PhysicsData(1.0, "meter"))
+        with pytest.raises(ValueError):
+            UncertaintyPropagation(self.moment_of_inertia, symbols=["x"])
+
+
+class TestUncertaintyBudget:
+    def setup_method(self):
+        self.mass = PhysicsData(2.5, "kilogram", symbol="M", uncertainty=1.3)
+        self.diameter = PhysicsData(3.1, "meter", symbol="D", uncertainty=0.81)
+        self.moment_of_inertia = Rational(1, 8) * self.mass * self.diameter ** 2
+
+    def test_budget(self):
+        budget = uncertainty_budget(self.moment_of_inertia)
+        assert budget.names == ("D", "M")
+        assert budget.units == ("meter", "kilogram")
+        assert budget.sensitivity_units == ("kilogram * meter", "meter ** 2")
+        assert budget.unit == "kilogram * meter ** 2"
+        np.testing.assert_allclose(budget.sensitivities, [2.5 * 3.1 / 4, 3.1 ** 2 / 8])
+        np.testing.assert_allclose(budget.contributions,
+                                   [2.5 * 3.1 / 4 * 0.81, 3.1 ** 2 / 8 * 1.3])
+        assert budget.percentages.sum() == pytest.approx(100)
+        assert budget.uncertainty == pytest.approx(
+            combined_standard_uncertainty(self.moment_of_inertia).value)
+
+    def test_budget_arrays(self):
+        propagation = UncertaintyPropagation(self.moment_of_inertia)
+        masses = np.array([1.0, 2.0, 3.0])
+        budget = propagation.budget({"M": masses}, {"D": 0.1})
+        assert budget.sensitivities.shape == (2, 3)
+        np.testing.assert_allclose(budget.input_values[1], masses)
+        np.testing.assert_allclose(budget.input_uncertainties[0], 0.1)
+        np.testing.assert_allclose(budget.contributions[0], masses * 3.1 / 4 * 0.1)
+        np.testing.assert_allclose(budget.percentages.sum(axis=0), 100)
+        _, uncertainty = propagation.evaluate({"M": masses}, {"D": 0.1})
+        np.testing.assert_allclose(budget.uncertainty, uncertainty.value)
+
+    def test_to_latex(self):
+        text = uncertainty_budget(self.moment_of_inertia).to_latex()
+        assert text.startswith("\\begin{tabular}{cccccc}")
+        assert "$M$ & $2.5\\ \\mathrm{kg}$ & $1.3\\ \\mathrm{kg}$ & " \
+            "$1.2\\ \\mathrm{m}^{2}$ & $1.56\\ \\mathrm{kg} \\cdot \\mathrm{m}^{2}$" in text
+
+        budget = uncertainty_budget(self.moment_of_inertia, {"M": np.array([1.0, 2.5])})
+        assert budget.to_latex(index=1) == text
+        with pytest.raises(ValueError):
+            budget.to_latex()
+
+
+class TestCovariancePropagation:
+    def setup_method(self):
+        self.length = PhysicsData(1.2, "meter", symbol="L", uncertainty=0.01)
+        self.time = PhysicsData(2.0, "second", symbol="T", uncertainty=0.02)
+        self.mass = PhysicsData(0.5, "kilogram", symbol="m", uncertainty=0.001)
+        self.velocity = self.length / self.time
+        self.momentum = self.mass * self.velocity
+
+    def test_independent_inputs(self):
+        propagation = CovariancePropagation([self.velocity, self.momentum])
+        assert propagation.symbols == ("L", "T", "m")
+        result = propagation.evaluate()
+        assert result.units == ("meter / second", "kilogram * meter / second")
+        assert result.values[1].value == pytest.approx(0.3)
+        for output, uncertainty in zip([self.velocity, self.momentum], result.uncertainties()):
+            assert uncertainty.value == pytest.approx(
+                combined_standard_uncertainty(output).value)
+            assert uncertainty.unit == output.unit
+        np.testing.assert_allclose(np.diagonal(result.correlation()), 1)
+
+    def test_correlated_inputs(self):
+        propagation = CovariancePropagation(self.velocity)
+        covariance = propagation.covariance_matrix(correlations={("T", "L"): 0.5})
+        np.testing.assert_allclose(covariance, [[1e-4, 1e-4], [1e-4, 4e-4]])
+        result = propagation.evaluate(covariance=covariance)
+        jacobian = np.array([1 / 2.0, -1.2 / 2.0 ** 2])
+        assert result.covariance.shape == (1, 1)
+        assert result.covariance[0, 0] == pytest.approx(jacobian @ covariance @ jacobian)
+
+    def test_arrays(self):
+        propagation = CovariancePropagation([self.velocity, self.momentum])
+        lengths = np.linspace(1.0, 2.0, 5)
+        covariance = propagation.covariance_matrix({"L": lengths * 0.01},
+                                                   {("L", "T"): -0.3})
+        assert covariance.shape == (5, 3, 3)
+        result = propagation.evaluate({"L": lengths}, covariance)
+        assert result.covariance.shape == (5, 2, 2)
+        np.testing.assert_allclose(result.values[0].value, lengths / 2.0)
+
+        jacobian = propagation.jacobian({"L": lengths})
+        assert jacobian.shape == (5, 2, 3)
+        for i in range(5):
+            np.testing.assert_allclose(result.covariance[i],
+                                       jacobian[i] @ covariance[i] @ jacobian[i].T)
+
+    def test_exceptions(self):
+        with pytest.raises(ValueError):
+            CovariancePropagation([])
+        with pytest.raises(TypeError):
+            CovariancePropagation([self.velocity, 1.0])
+        with pytest.raises(ValueError):
+            CovariancePropagation(self.velocity, symbols=["x"])
+        propagation = CovariancePropagation(self.velocity)
+        with pytest.raises(ValueError):
+            propagation.covariance_matrix(correlations={("L", "T"): 1.5})
+        with pytest.raises(ValueError):
+            propagation.covariance_matrix(correlations={("L", "m"): 0.5})
+        with pytest.raises(ValueError):
+            propagation.evaluate(covariance=np.eye(3))
+
+
+class TestMonteCarloUncertainty:
+    def test_linear(self):
+        length1 = PhysicsData(2.0, "meter", symbol="x", uncertainty=0.3)
+        length2 = PhysicsData(3.0, "meter", symbol="y", uncertainty=0.4)
+        result = monte_carlo_uncertainty(length1 + length2, n_samples=200000, rng=0)
+        assert result.unit == "meter"
+        assert result.n_samples == 200000
+        assert result.mean == pytest.approx(5.0, abs=0.01)
+        assert result.standard_deviation == pytest.approx(0.5, rel=0.01)
+        low, high = result.coverage_interval
+        assert low == pytest.approx(5.0 - 1.96 * 0.5, abs=0.02)
+        assert high == pytest.approx(5.0 + 1.96 * 0.5, abs=0.02)
+        data = result.to_physicsdata()
+        assert data.uncertainty == result.standard_deviation
+
+    def test_nonlinear_chunked(self):
+        value = PhysicsData(1.0, "dimensionless", symbol="a", uncertainty=0.5)
+        result = monte_carlo_uncertainty(exp(value), n_samples=200000, rng=1,
+                                         chunk_size=30000)
+        assert result.n_samples == 200000
+        assert result.mean == pytest.approx(np.exp(1.125), rel=0.01)
+        assert result.standard_deviation == pytest.approx(
+            np.sqrt((np.exp(0.25) - 1) * np.exp(2.25)), rel=0.02)
+
+    def test_small_chunks_keep_the_coverage_interval(self):
+        value = PhysicsData(0.0, "dimensionless", symbol="a", uncertainty=1.0)
+        exact = monte_carlo_uncertainty(value * 1, n_samples=20000, rng=3).coverage_interval
+        for chunk_size in [1000, 10, 1]:
+            interval = monte_carlo_uncertainty(value * 1, n_samples=20000, rng=3,
+                                               chunk_size=chunk_size).coverage_interval
+            np.testing.assert_allclose(interval, exact, atol=1e-3)
+
+    def test_seed_is_reproducible(self):
+        length = PhysicsData(2.0, "meter", symbol="x", uncertainty=0.3)
+        area = length * length
+        assert monte_carlo_uncertainty(area, n_samples=1000, rng=5) \
+            == monte_carlo_uncertainty(area, n_samples=1000, rng=np.random.default_rng(5))
+
+    def test_exceptions(self):
+        length = PhysicsData(2.0, "meter", symbol="x", uncertainty=0.3)
+        with pytest.raises(ValueError):
+            monte_carlo_uncertainty(PhysicsData(1.0, "meter"))
+        with pytest.raises(ValueError):
+            monte_carlo_uncertainty(length, n_samples=1)
+        with pytest.raises(ValueError):
+            monte_carlo_uncertainty(length, coverage=1.5)
+
+
+class TestCombinedStandardUncertaintyParallel:
+    def setup_method(self):
+        self.lengths = [PhysicsData(1.0 + i, "meter", symbol=f"x_{i}", uncertainty=0.1 * (i + 1))
+                        for i in range(6)]
+        total = self.lengths[0]
+        for length in self.lengths[1:]:
+            total = total * length / (length + self.lengths[0])
+        self.total = total
+
+    def test_process_pool(self):
+        serial = combined_standard_uncertainty(self.total)
+        parallel = combined_standard_uncertainty(self.total, parallel=True, max_workers=2)
+        assert parallel.symbol == serial.symbol
+        assert parallel.unit == serial.unit
+        assert parallel._base_symbols == serial._base_symbols
+
+    def test_executor(self):
+        serial = combined_standard_uncertainty(self.total, relative=True)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            parallel = combined_standard_uncertainty(self.total, relative=True,
+                                                     executor=executor)
+        assert parallel.symbol == serial.symbol
+        assert parallel.value == serial.value
+
+    def test_default_max_workers(self):
+        assert default_max_workers(1) == 1
+        assert 1 <= default_max_workers(1000) <= 1000
+
+
+def test_broadcast_shape():
+    arrays = [1.0] * 40 + [np.zeros((3, 1)), np.zeros(4)]
+    assert _broadcast_shape(arrays) == (3, 4)
+    assert _broadcast_shape([]) == ()
+    with pytest.raises(ValueError):
+        _broadcast_shape([np.zeros(2), np.zeros(3)])
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from ueca.symbolf import Rational
+from ueca.uncertainty import combined_standard_uncertainty
+from ueca.worksheet import Worksheet
+
+
+def make_worksheet():
+    worksheet = Worksheet()
+    worksheet.set_input("L", 100.0, "centimeter", uncertainty=0.1)
+    worksheet.set_input("T", 2.0, "second", uncertainty=0.01)
+    worksheet.set_input("m", 0.5, "kilogram")
+    worksheet.define("g", "4*pi**2*L/T**2")
+    worksheet.define("v", worksheet["L"] / worksheet["T"])
+    worksheet.define("E", Rational(1, 2) * worksheet["m"] * worksheet["v"] ** 2)
+    return worksheet
+
+
+def test_dependencies():
+    worksheet = make_worksheet()
+    assert worksheet.inputs == ("L", "T", "m")
+    assert worksheet.quantities == ("g", "v", "E")
+    assert worksheet.dependencies("g") == ("L", "T")
+    assert worksheet.dependencies("E") == ("L", "T", "m")
+    assert worksheet.dependents("m") == ("E",)
+    assert list(worksheet) == ["L", "T", "m", "g", "v", "E"]
+
+
+def test_evaluate():
+    worksheet = make_worksheet()
+    g = worksheet.evaluate("g")
+    assert g.unit == "centimeter / second ** 2"
+    assert g.value.nominal_value == pytest.approx(np.pi ** 2 * 100)
+    assert g.uncertainty == pytest.approx(
+        combined_standard_uncertainty(worksheet["g"]).value)
+    assert worksheet.evaluate("L").uncertainty == 0.1
+
+
+def test_only_dependents_are_recomputed():
+    worksheet = make_worksheet()
+    assert worksheet.recompute() == ("g", "v", "E")
+    assert worksheet.dirty == ()
+
+    worksheet.set_input("m", 0.6)
+    assert worksheet.dirty == ("E",)
+    assert not worksheet.is_dirty("g")
+    assert worksheet.recompute() == ("E",)
+    assert worksheet.evaluate("E").value.nominal_value == pytest.approx(0.3 * 50.0 ** 2)
+
+    worksheet.set_input("T", 4.0)
+    assert worksheet.dirty == ("g", "v", "E")
+    assert worksheet.evaluate("v").value.nominal_value == pytest.approx(25.0)
+
+
+def test_set_input_keeps_unit_and_uncertainty():
+    worksheet = make_worksheet()
+    worksheet.set_input("L", 1.0, "meter")
+    L = worksheet.evaluate("L")
+    assert (L.unit, L.uncertainty) == ("meter", pytest.approx(0.001))
+    assert worksheet.evaluate("g").value.nominal_value == pytest.approx(np.pi ** 2 * 100)
+
+    with pytest.raises(ValueError):
+        worksheet.set_input("L", 1.0, "second")
+    assert worksheet.evaluate("L").unit == "meter"
+    assert not worksheet.is_dirty("g")
+
+    worksheet.set_input("L", np.array([0.99, 1.0]))
+    np.testing.assert_allclose(worksheet.evaluate("g").value,
+                               np.pi ** 2 * np.array([99.0, 100.0]))
+
+
+def test_offset_unit_uncertainties():
+    worksheet = Worksheet()
+    worksheet.set_input("T", 300.0, "kelvin", uncertainty=0.5)
+    worksheet.define("E", 2 * worksheet["T"])
+    worksheet.set_input("T", 20.0, "degC")
+    assert worksheet.evaluate("T").uncertainty == pytest.approx(0.5)
+    E = worksheet.evaluate("E")
+    assert E.value.nominal_value == pytest.approx(2 * 293.15)
+    assert E.uncertainty == pytest.approx(1.0)
+
+    worksheet.set_input("T", 20.0, "degC", uncertainty=0.25)
+    assert worksheet.evaluate("E").uncertainty == pytest.approx(0.5)
+    worksheet.set_input("T", 300.0, "kelvin")
+    assert worksheet.evaluate("T").uncertainty == pytest.approx(0.25)
+
+
+def test_to_latex():
+    worksheet = make_worksheet()
+    assert worksheet.to_latex("g") == \
+        "$g = \\frac{4 \\pi^{2} L}{T^{2}}\\ \\frac{\\mathrm{cm}}{\\mathrm{s}^{2}}$"
+    assert worksheet.to_latex("g", force_value=True).startswith("$g = \\left(987 \\pm 10\\right)")
+
+    worksheet.set_input("L", 200.0)
+    assert worksheet.to_latex("g", force_value=True).startswith("$g = \\left(1974 \\pm 20")
+
+
+def test_define_and_remove():
+    worksheet = make_worksheet()
+    worksheet.define("g", worksheet["L"] / worksheet["T"] ** 2)
+    assert worksheet.evaluate("g").value.nominal_value == pytest.approx(25.0)
+    assert worksheet.quantities == ("v", "E", "g")
+
+    with pytest.raises(ValueError):
+        worksheet.remove("m")
+    worksheet.remove("E")
+    worksheet.remove("m")
+    assert "m" not in worksheet
+
+    with pytest.raises(ValueError):
+        worksheet.define("L", worksheet["T"])
+    with pytest.raises(ValueError):
+        worksheet.set_input("g", 1.0)
+    with pytest.raises(TypeError):
+        worksheet.define("x", 1.0)
+    with pytest.raises(KeyError):
+        worksheet.evaluate("x")
@@ -0,0 +1,6 @@
+import sys
+
+from ueca.cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,232 @@
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Union
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class LRUCache:
+    """Thread-safe mapping with least-recently-used eviction and hit/miss counters
+
+    ``maxsize=None`` disables eviction.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative or None: '{maxsize}'")
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        return self._maxsize
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative or None: '{maxsize}'")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # The factory runs outside the lock so slow builds don't serialize other threads.
+        value = factory()
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.set(key, value)
+        return value
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self._maxsize, len(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _evict(self) -> None:
+        if self._maxsize is None:
+            return
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class DiskCache:
+    """Directory of entries keyed by hex digests, shared by every process using it
+
+    An entry is written to a temporary file and renamed into place, so other
+    processes never read a partial one. Once the entries exceed ``max_bytes``
+    the least recently used are removed. Entries are unpickled by default, so
+    only point it at a directory you trust.
+    """
+
+    def __init__(self, directory: Union[str, "os.PathLike"],
+                 max_bytes: Optional[int] = 256 * 2 ** 20) -> None:
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f"max_bytes must be non-negative or None: '{max_bytes}'")
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # The modification time orders the entries for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        fd, temporary = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temporary, self.__path(key))
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporary)
+            raise
+        self._evict()
+
+    def get_or_create(self, key: str, factory: Callable[[], Any],
+                      dumps: Callable[[Any], bytes] = pickle.dumps,
+                      loads: Callable[[bytes], Any] = pickle.loads) -> Any:
+        data = self.get(key)
+        if data is not None:
+            try:
+                return loads(data)
+            except Exception:
+                # A corrupted or outdated entry is rebuilt like a missing one
+                self.hits -= 1
+                self.misses += 1
+
+        value = factory()
+        data = dumps(value)
+        if data is not None:
+            self.set(key, data)
+        return value
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.max_bytes,
+                         sum(size for _, _, size in self.__entries()))
+
+    def clear(self) -> None:
+        for path, _, _ in self.__entries():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        entries = sorted(self.__entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            # Another process may have evicted it already
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def __entries(self) -> list:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".tmp-"):
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+
+def digest(*parts: str) -> str:
+    """Hex SHA-256 of ``parts``, stable across processes unlike ``hash``"""
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part.encode("utf-8"))
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+_disk_cache = None
+_disk_cache_configured = False
+
+
+def set_disk_cache(directory: Optional[Union[str, "os.PathLike"]],
+                   max_bytes: Optional[int] = 256 * 2 ** 20) -> Optional[DiskCache]:
+    """Keep compiled functions and derived expressions in ``directory`` across processes
+
+    ``None`` turns the disk cache off. Without a call, the directory is taken
+    from the environment variable ``UECA_CACHE_DIR`` when it is set.
+    """
+    global _disk_cache, _disk_cache_configured
+    _disk_cache = None if directory is None else DiskCache(directory, max_bytes)
+    _disk_cache_configured = True
+    return _disk_cache
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    if not _disk_cache_configured:
+        set_disk_cache(os.environ.get("UECA_CACHE_DIR") or None)
+    return _disk_cache
+
+
+_MISSING = object()
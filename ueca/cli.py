@@ -0,0 +1,65 @@
+import argparse
+import functools
+import sys
+from typing import List, Optional
+
+from ueca import runner
+from ueca.lazy import lazy_import
+
+
+pint = lazy_import("pint")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="ueca", description="UECA experiment runner")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser("run", help="evaluate the experiments of a spec file")
+    run_parser.add_argument("spec", help="JSON, TOML or YAML spec file")
+    run_parser.add_argument("-j", "--workers", type=int, default=None,
+                            help="number of worker processes (default: one per CPU)")
+    run_parser.add_argument("--chunk-size", type=int, default=None,
+                            help="rows of a data file held in memory at once")
+    run_parser.add_argument("-o", "--output", default=None, help="output directory")
+    run_parser.add_argument("-f", "--format", action="append", choices=runner.FORMATS,
+                            dest="formats", help="output format, may be repeated")
+    run_parser.add_argument("--force", action="store_true",
+                            help="rerun experiments whose outputs are up to date")
+    run_parser.add_argument("-q", "--quiet", action="store_true", help="don't report progress")
+
+    args = parser.parse_args(argv)
+    try:
+        spec = runner.load_spec(args.spec)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"ueca: error: {e}\n")
+
+    if args.chunk_size is not None:
+        spec["chunk_size"] = args.chunk_size
+    if args.output is not None:
+        spec["output"] = args.output
+    if args.formats:
+        spec["formats"] = args.formats
+
+    try:
+        results = runner.run(spec, workers=args.workers, force=args.force,
+                             progress=functools.partial(_progress, args.quiet), keep_going=True)
+    except (OSError, ValueError, TypeError, pint.errors.PintError) as e:
+        parser.exit(1, f"ueca: error: {e}\n")
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+def _progress(quiet: bool, done: int, total: int, result: runner.ExperimentResult) -> None:
+    # Failures are reported even when quiet
+    if result.error is not None:
+        print(f"[{done}/{total}] {result.name}: error: {result.error}", file=sys.stderr)
+        return
+    if quiet:
+        return
+    status = "up to date" if result.skipped else "done"
+    rows = "" if result.rows is None else f", {result.rows} rows"
+    print(f"[{done}/{total}] {result.name}: {status}{rows}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
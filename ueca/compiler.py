@@ -0,0 +1,99 @@
+import builtins
+import importlib
+import inspect
+import json
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+from ueca import profiling
+from ueca.cache import CacheInfo, digest, get_disk_cache, LRUCache
+from ueca.lazy import lazy_import
+
+
+sympy = lazy_import("sympy")
+
+
+_compiled_functions = LRUCache(maxsize=512)
+
+
+def compile_expr(args: Sequence["sympy.Symbol"],
+                 expr: Union["sympy.Basic", Sequence["sympy.Basic"]],
+                 cse: bool = True) -> Callable:
+    """Return a numpy function of ``args`` evaluating ``expr``, shared process-wide
+
+    A sequence of expressions compiles to one function returning a tuple. With
+    ``cse`` the subterms shared within and across the expressions are computed once.
+    When a disk cache is set with ``ueca.cache.set_disk_cache``, the generated
+    source is reused by other processes instead of running lambdify again.
+    """
+    args = tuple(args)
+    if isinstance(expr, (list, tuple)):
+        expr = tuple(expr)
+    key = (args, expr, cse)
+    return _compiled_functions.get_or_create(key, lambda: _compile(args, expr, cse))
+
+
+def _compile(args: tuple, expr: Any, cse: bool) -> Callable:
+    disk_cache = get_disk_cache()
+    if disk_cache is None:
+        return _lambdify(args, expr, cse)
+
+    key = digest("lambdify", sympy.__version__, sympy.srepr(args), sympy.srepr(expr), str(cse))
+    return disk_cache.get_or_create(key, lambda: _lambdify(args, expr, cse),
+                                    dumps=_dump_function, loads=_load_function)
+
+
+def _dump_function(function: Callable) -> Optional[bytes]:
+    namespace = _numpy_namespace()
+    for name in function.__code__.co_names:
+        if name in function.__globals__ and namespace.get(name) is not function.__globals__[name]:
+            # The source refers to an object of its own, so it can't be rebuilt from text
+            return None
+    try:
+        source = inspect.getsource(function)
+    except OSError:
+        return None
+    return json.dumps({"name": function.__name__, "source": source}).encode("utf-8")
+
+
+def _load_function(data: bytes) -> Callable:
+    entry = json.loads(data.decode("utf-8"))
+    namespace = dict(_numpy_namespace())
+    exec(compile(entry["source"], "<ueca compiled>", "exec"), namespace)
+    return namespace[entry["name"]]
+
+
+_namespace = None
+
+
+def _numpy_namespace() -> Dict[str, Any]:
+    # Rebuilt like lambdify builds it for the numpy module, without loading sympy's printers
+    global _namespace
+    if _namespace is None:
+        lambdify_module = importlib.import_module("sympy.utilities.lambdify")
+        _, defaults, translations, imports = lambdify_module.MODULES["numpy"]
+        namespace = {}
+        for statement in imports:
+            exec(statement, namespace)
+        namespace.update(defaults)
+        for name, translation in translations.items():
+            namespace[name] = namespace[translation]
+        namespace.update({"builtins": builtins, "range": range})
+        _namespace = namespace
+    return _namespace
+
+
+@profiling.timed("compiler.lambdify")
+def _lambdify(args: tuple, expr: Any, cse: bool) -> Callable:
+    return sympy.lambdify(args, expr, modules="numpy", cse=cse)
+
+
+def cache_info() -> CacheInfo:
+    return _compiled_functions.info()
+
+
+def clear_cache() -> None:
+    _compiled_functions.clear()
+
+
+def set_cache_limit(maxsize: Optional[int]) -> None:
+    _compiled_functions.resize(maxsize)
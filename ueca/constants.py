@@ -1,45 +1,73 @@
-from scipy.constants import physical_constants
+import sys
+from typing import Any, List
 
 from ueca.data import PhysicsData
 
 
-# 真空中の光速度
-c = PhysicsData(*physical_constants["speed of light in vacuum"][:2], symbol="c")
+# Each constant is built from scipy.constants on first access.
+# name: (key of physical_constants, unit to convert to)
+_CONSTANTS = {
+    # 真空中の光速度
+    "c": ("speed of light in vacuum", None),
+    # 素電荷
+    "e": ("atomic unit of charge", None),
+    # 電気定数
+    "epsilon_0": ("vacuum electric permittivity", None),
+    # 重力加速度(標準値)
+    "g": ("standard acceleration of gravity", None),
+    # 万有引力定数
+    "G": ("Newtonian constant of gravitation", "N*m^2/kg^2"),
+    # プランク定数
+    "h": ("Planck constant", "J*s"),
+    # ボルツマン定数
+    "k": ("Boltzmann constant", None),
+    # 電子の質量
+    "m_e": ("electron mass", None),
+    # 陽子の質量
+    "m_p": ("proton mass", None),
+    # 原子質量単位
+    "m_u": ("atomic mass constant", None),
+    # 磁気定数
+    "mu_0": ("vacuum mag. permeability", "H/m"),
+    # アボガドロ定数
+    "N_A": ("Avogadro constant", None),
+    # 気体定数
+    "R": ("molar gas constant", None),
+}
 
-# 素電荷
-e = PhysicsData(*physical_constants["atomic unit of charge"][:2], symbol="e")
+_ALIASES = {"gas_constant": "R"}
 
-# 電気定数
-epsilon_0 = PhysicsData(*physical_constants["vacuum electric permittivity"][:2], symbol="epsilon_0")
+__all__ = list(_CONSTANTS) + list(_ALIASES)
 
-# 重力加速度(標準値)
-g = PhysicsData(*physical_constants["standard acceleration of gravity"][:2], symbol="g")
 
-# 万有引力定数
-G = PhysicsData(*physical_constants["Newtonian constant of gravitation"][:2],
-                symbol="G").unit_to("N*m^2/kg^2")
+def _build(symbol: str) -> PhysicsData:
+    from scipy.constants import physical_constants
 
-# プランク定数
-h = PhysicsData(*physical_constants["Planck constant"][:2], symbol="h").unit_to("J*s")
+    key, unit = _CONSTANTS[symbol]
+    data = PhysicsData(*physical_constants[key][:2], symbol=symbol)
+    if unit is not None:
+        data = data.unit_to(unit)
+    return data
 
-# ボルツマン定数
-k = PhysicsData(*physical_constants["Boltzmann constant"][:2], symbol="k")
 
-# 電子の質量
-m_e = PhysicsData(*physical_constants["electron mass"][:2], symbol="m_e")
+def __getattr__(name: str) -> Any:
+    symbol = _ALIASES.get(name, name)
+    if symbol not in _CONSTANTS:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
-# 陽子の質量
-m_p = PhysicsData(*physical_constants["proton mass"][:2], symbol="m_p")
+    # setdefault keeps a single instance when threads race on first access
+    data = globals().setdefault(symbol, _build(symbol))
+    for alias, target in _ALIASES.items():
+        if target == symbol:
+            globals().setdefault(alias, data)
+    return data
 
-# 原子質量単位
-m_u = PhysicsData(*physical_constants["atomic mass constant"][:2], symbol="m_u")
 
-# 磁気定数
-mu_0 = PhysicsData(*physical_constants["vacuum mag. permeability"][:2],
-                   symbol="mu_0").unit_to("H/m")
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
 
-# アボガドロ定数
-N_A = PhysicsData(*physical_constants["Avogadro constant"][:2], symbol="N_A")
 
-# 気体定数
-R = gas_constant = PhysicsData(*physical_constants["molar gas constant"][:2], symbol="R")
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) is unavailable, so build every constant up front.
+    for _name in __all__:
+        __getattr__(_name)
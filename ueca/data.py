@@ -1,49 +1,73 @@
-import pint
-import sympy
+import numpy
 
-import copy
+import functools
+import sys
+import threading
 from numbers import Real
-from typing import Any, Optional, Union
+from typing import Any, Dict, Mapping, Optional, Union
 
-from ueca.latex import translate_space_latex
+from ueca import profiling
+from ueca.cache import CacheInfo, LRUCache
+from ueca.compiler import compile_expr
+from ueca.environment import EMPTY, SymbolEnvironment
+from ueca.lazy import lazy_import
 
 
-ureg = pint.UnitRegistry()
-ureg.default_system = "SI"
+pint = lazy_import("pint")
+sympy = lazy_import("sympy")
 
+_symbolic_latex_texts = LRUCache(maxsize=1024)
 
-class PhysicsData:
-    def __init__(self, value: Any, unit: str, left_side: str = "",
-                 symbol: Optional[Union[str, sympy.Basic]] = None,
-                 uncertainty: Optional[Real] = None,
-                 base_symbols: Optional[dict] = None) -> None:
-        if isinstance(symbol, str):
-            if not symbol.isdecimal() and symbol != "":
-                symbol = sympy.Symbol(symbol)
+_registry = None
+_registry_lock = threading.Lock()
 
-        if isinstance(symbol, sympy.Basic):
-            self.data = ureg.Quantity(symbol, unit)
-        else:
-            self.data = ureg.Quantity(value, unit)
-            if uncertainty:
-                self.data = self.data.plus_minus(uncertainty)
 
-        self.symbol = symbol
-        self.__uncertainty = uncertainty
-        self.left_side = left_side
+def latex_cache_info() -> CacheInfo:
+    return _symbolic_latex_texts.info()
+
+
+def clear_latex_cache() -> None:
+    _symbolic_latex_texts.clear()
+
+
+def get_registry() -> "pint.UnitRegistry":
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = _new_registry()
+    return _registry
+
+
+@profiling.timed("data.registry")
+def _new_registry() -> "pint.UnitRegistry":
+    registry = pint.UnitRegistry()
+    registry.default_system = "SI"
+    return registry
 
-        if base_symbols is None:
-            self._base_symbols = dict()
-        else:
-            self._base_symbols = base_symbols
 
-        if isinstance(symbol, sympy.Symbol) and str(symbol) not in self._base_symbols:
-            data = ureg.Quantity(value, unit)
-            if uncertainty:
-                data = data.plus_minus(uncertainty)
-            self._base_symbols[str(symbol)] = data
+def __getattr__(name: str) -> Any:
+    # ``ureg`` is built on first use so that ``import ueca`` stays cheap.
+    if name == "ureg":
+        return get_registry()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) is unavailable, so build the registry up front.
+    ureg = get_registry()
+
+
+class PhysicsDataBase:
+    """Operators, evaluation and printing shared by PhysicsData and NumericData
+
+    It holds no fields, so each subclass declares only the slots it uses.
+    """
+
+    __slots__ = ()
 
     @property
+    @profiling.timed("data.value")
     def value(self) -> Any:
         if self.is_symbolic():
             base_symbols = sorted(self._base_symbols.keys())
@@ -51,90 +75,111 @@ class PhysicsData:
             values = []
             for k in base_symbols:
                 data = self._base_symbols[k]
-                if isinstance(data, ureg.Measurement):
+                if isinstance(data, get_registry().Measurement):
                     data = data.value
                 values.append(data.magnitude)
-            return sympy.lambdify(symbol_args, self.symbol, modules="numpy")(*values)
+            return compile_expr(symbol_args, self.symbol)(*values)
         return self.data.magnitude
 
     @property
     def unit(self) -> str:
         return str(self.data.units)
 
-    @property
-    def uncertainty(self) -> Optional[Real]:
-        if isinstance(self.data, ureg.Measurement):
-            return self.data.error.magnitude
-        return self.__uncertainty
+    @profiling.timed("data.evaluate_batch")
+    def evaluate_batch(self, values: Mapping[str, Any],
+                       uncertainties: Optional[Mapping[str, Any]] = None) -> "PhysicsData":
+        if not self.is_symbolic():
+            raise ValueError("'PhysicsData' isn't the symbolic mode")
+
+        from ueca.uncertainty import UncertaintyPropagation
+
+        measured = [k for k, v in self._base_symbols.items()
+                    if isinstance(v, get_registry().Measurement) or k in (uncertainties or {})]
+        propagation = UncertaintyPropagation(self, symbols=measured, use_cancel=False)
+        value, error = propagation.evaluate(values, uncertainties)
+        if not measured:
+            return PhysicsData(value.value, self.unit)
+        return PhysicsData(value.value, self.unit, uncertainty=error.value)
 
     def is_symbolic(self) -> bool:
-        if isinstance(self.symbol, sympy.Basic):
-            return True
-        return False
+        return _is_basic(self.symbol)
 
-    def __new_instance_updated(self, value: Any, unit: str,
+    def __new_instance_updated(self, value: Any, unit: "pint.Unit",
                                other: "PhysicsData") -> "PhysicsData":
-        if self.is_symbolic():
-            symbols = copy.deepcopy(self._base_symbols)
-            symbols.update(other._base_symbols)
-            return PhysicsData(None, unit, symbol=value,
-                               base_symbols=symbols)
-        elif other.is_symbolic():
+        if self.is_symbolic() or other.is_symbolic():
             return PhysicsData(None, unit, symbol=value,
-                               base_symbols=other._base_symbols)
+                               base_symbols=self._env.merge(other._env))
         else:
-            return PhysicsData(value, unit)
+            return self._new_numeric(value, unit)
 
+    def _new_numeric(self, value: Any, unit: "pint.Unit") -> "PhysicsData":
+        return PhysicsData(value, unit)
+
+    @profiling.timed("data.operators")
     def __add__(self, other: Any) -> "PhysicsData":
         other = as_physicsdata(other)
         new_data = self.data + other.data
-        return self.__new_instance_updated(new_data.magnitude, str(new_data.units), other)
+        return self.__new_instance_updated(new_data.magnitude, new_data.units, other)
 
     __radd__ = __add__
 
+    @profiling.timed("data.operators")
     def __sub__(self, other: Any) -> "PhysicsData":
         other = as_physicsdata(other)
         new_data = self.data - other.data
-        return self.__new_instance_updated(new_data.magnitude, str(new_data.units), other)
+        return self.__new_instance_updated(new_data.magnitude, new_data.units, other)
 
+    @profiling.timed("data.operators")
     def __rsub__(self, other: Any) -> "PhysicsData":
         other = as_physicsdata(other)
         new_data = other.data - self.data
-        return self.__new_instance_updated(new_data.magnitude, str(new_data.units), other)
+        return self.__new_instance_updated(new_data.magnitude, new_data.units, other)
 
+    @profiling.timed("data.operators")
     def __mul__(self, other: Any) -> "PhysicsData":
         other = as_physicsdata(other)
         new_data = self.data * other.data
-        return self.__new_instance_updated(new_data.magnitude, str(new_data.units), other)
+        return self.__new_instance_updated(new_data.magnitude, new_data.units, other)
 
     __rmul__ = __mul__
 
+    @profiling.timed("data.operators")
     def __floordiv__(self, other: Any) -> "PhysicsData":
         other = as_physicsdata(other)
         new_value = self.data.magnitude // other.data.magnitude
-        new_unit = str(self.data.units / other.data.units)
+        new_unit = self.data.units / other.data.units
         return self.__new_instance_updated(new_value, new_unit, other)
 
+    @profiling.timed("data.operators")
     def __rfloordiv__(self, other: Any) -> "PhysicsData":
         other = as_physicsdata(other)
         new_value = other.data.magnitude // self.data.magnitude
-        new_unit = str(other.data.units / self.data.units)
+        new_unit = other.data.units / self.data.units
         return self.__new_instance_updated(new_value, new_unit, other)
 
+    @profiling.timed("data.operators")
     def __truediv__(self, other: Any) -> "PhysicsData":
         other = as_physicsdata(other)
         new_data = self.data / other.data
-        return self.__new_instance_updated(new_data.magnitude, str(new_data.units), other)
+        return self.__new_instance_updated(new_data.magnitude, new_data.units, other)
 
+    @profiling.timed("data.operators")
     def __rtruediv__(self, other: Any) -> "PhysicsData":
         other = as_physicsdata(other)
         new_data = other.data / self.data
-        return self.__new_instance_updated(new_data.magnitude, str(new_data.units), other)
+        return self.__new_instance_updated(new_data.magnitude, new_data.units, other)
 
+    @profiling.timed("data.operators")
     def __pow__(self, n: Union[int, float]) -> "PhysicsData":
         other = as_physicsdata(n)
         new_data = self.data ** other.data
-        return self.__new_instance_updated(new_data.magnitude, str(new_data.units), other)
+        return self.__new_instance_updated(new_data.magnitude, new_data.units, other)
+
+    def __reduce__(self) -> tuple:
+        from ueca import serialize
+
+        # pint would unpickle the quantities into its application registry, not this one
+        return serialize._from_state, (serialize._state(self),)
 
     def __repr__(self) -> str:
         return str(self.data)
@@ -143,6 +188,21 @@ class PhysicsData:
         return self.__repr__()
 
     def _repr_latex_(self, force_value: bool = False, symbolic_unit: bool = True) -> str:
+        text = self._latex_right_side(force_value, symbolic_unit)
+
+        if self.left_side != "":
+            text = f"{self.left_side} = {text}"
+
+        return text
+
+    def _latex_right_side(self, force_value: bool = False, symbolic_unit: bool = True) -> str:
+        if self.is_symbolic() and not force_value:
+            key = (self.symbol, self.data.units, symbolic_unit)
+            return _symbolic_latex_texts.get_or_create(
+                key, lambda: self.__latex_text(force_value, symbolic_unit))
+        return self.__latex_text(force_value, symbolic_unit)
+
+    def __latex_text(self, force_value: bool, symbolic_unit: bool) -> str:
         latex_spec = "{:~L}"
         if not symbolic_unit:
             latex_spec = latex_spec.replace("~", "")
@@ -153,8 +213,9 @@ class PhysicsData:
                 if self.uncertainty:
                     data = data.plus_minus(self.uncertainty)
             else:
-                with translate_space_latex():
-                    data = PhysicsData(sympy.latex(self.symbol), self.unit).data
+                from ueca import latex
+
+                data = PhysicsData(latex.latex(self.symbol), self.unit).data
         else:
             data = self.data
 
@@ -165,24 +226,416 @@ class PhysicsData:
             if text.endswith("\\"):
                 text = text[:-1]
 
-        if self.left_side != "":
-            text = f"{self.left_side} = {text}"
-
         return text
 
     def subs(self) -> "PhysicsData":
         return PhysicsData(self.value, self.unit, uncertainty=self.uncertainty)
 
     def unit_to(self, unit: str):
-        new_data = self.data.to(unit)
-        return PhysicsData(new_data.magnitude, str(new_data.units), symbol=self.symbol,
+        units = as_units(unit)
+        conversion = _conversion(self.data.units, units)
+        if self.is_symbolic():
+            # The symbol is kept as is, so only the dimensionality has to be checked
+            magnitude = None
+        elif conversion is None:
+            magnitude = self.data.to(units).magnitude
+        else:
+            magnitude = _convert(self.data.magnitude, conversion)
+        return PhysicsData(magnitude, units, symbol=self.symbol,
                            base_symbols=self._base_symbols)
 
     def to_latex(self, force_value: bool = False, symbolic_unit: bool = True) -> str:
         return f"${self._repr_latex_(force_value=force_value, symbolic_unit=symbolic_unit)}$"
 
 
+class _PhysicsDataType(type):
+    # NumericData doesn't inherit PhysicsData's slots, but is still accepted wherever it is
+    def __instancecheck__(cls, obj: Any) -> bool:
+        if cls is PhysicsData:
+            return isinstance(obj, PhysicsDataBase)
+        return super().__instancecheck__(obj)
+
+    def __subclasscheck__(cls, subclass: type) -> bool:
+        if cls is PhysicsData:
+            return issubclass(subclass, PhysicsDataBase)
+        return super().__subclasscheck__(subclass)
+
+
+class PhysicsData(PhysicsDataBase, metaclass=_PhysicsDataType):
+    __slots__ = ("data", "symbol", "left_side", "__uncertainty", "_env", "_env_restricted")
+
+    def __init__(self, value: Any, unit: Union[str, "pint.Unit"], left_side: str = "",
+                 symbol: Optional[Union[str, "sympy.Basic"]] = None,
+                 uncertainty: Optional[Real] = None,
+                 base_symbols: Optional[Mapping] = None) -> None:
+        if isinstance(symbol, str):
+            if not symbol.isdecimal() and symbol != "":
+                symbol = sympy.Symbol(symbol)
+
+        unit = as_units(unit)
+        if _is_basic(symbol):
+            self.data = get_registry().Quantity(symbol, unit)
+        else:
+            self.data = _plus_minus(get_registry().Quantity(value, unit), uncertainty)
+
+        self.symbol = symbol
+        self.__uncertainty = uncertainty
+        self.left_side = left_side
+
+        self._env = SymbolEnvironment.coerce(base_symbols)
+        self._env_restricted = False
+
+        if _is_basic(symbol) and isinstance(symbol, sympy.Symbol) \
+                and str(symbol) not in self._env:
+            data = _plus_minus(get_registry().Quantity(value, unit), uncertainty)
+            self._env = self._env.with_symbol(str(symbol), data)
+
+    @property
+    def _base_symbols(self) -> SymbolEnvironment:
+        # Symbols cancelled out of the expression are dropped lazily on first access.
+        if not self._env_restricted:
+            if self.is_symbolic():
+                self._env = self._env.restrict({str(s) for s in self.symbol.free_symbols})
+            self._env_restricted = True
+        return self._env
+
+    @property
+    def uncertainty(self) -> Optional[Real]:
+        if isinstance(self.data, get_registry().Measurement):
+            return self.data.error.magnitude
+        return self.__uncertainty
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Fields the data is rebuilt from, used by ``ueca.serialize``"""
+        return {"data": self.data, "symbol": self.symbol, "left_side": self.left_side,
+                "uncertainty": self.__uncertainty, "base_symbols": self._base_symbols}
+
+
+class NumericData(PhysicsDataBase):
+    """Numeric-only PhysicsData holding magnitude, unit and uncertainty as plain fields
+
+    The pint quantity behind ``data`` is only built when it is needed, so large
+    collections of readings don't each keep a Quantity alive. Each unit's
+    dimension exponents and SI scale factor are precomputed once, so arithmetic
+    between NumericData checks dimensions by comparing them and never goes
+    through pint. Operands pint has to handle, such as symbolic data or offset
+    units like degC, fall back to the PhysicsData operators.
+    """
+
+    __slots__ = ("_magnitude", "_units", "_error", "_info")
+
+    def __init__(self, value: Any, unit: Union[str, "pint.Unit"],
+                 uncertainty: Optional[Real] = None) -> None:
+        units = as_units(unit)
+        # Lists would otherwise concatenate or repeat in the fast-path operators
+        if isinstance(value, (list, tuple)):
+            value = numpy.asarray(value)
+        if isinstance(uncertainty, (list, tuple)):
+            uncertainty = numpy.asarray(uncertainty)
+        if _is_measurement(value, uncertainty):
+            # The ufloat is created once so that correlations survive arithmetic
+            value = get_registry().Measurement(value, uncertainty, units).magnitude
+        self._magnitude = value
+        self._units = units
+        self._error = uncertainty
+        self._info = _unit_info(units)
+
+    @classmethod
+    def _new(cls, value: Any, units: "pint.Unit", info: Optional[tuple]) -> "NumericData":
+        obj = cls.__new__(cls)
+        obj._magnitude = value
+        obj._units = units
+        obj._error = None
+        obj._info = info
+        return obj
+
+    @property
+    def data(self) -> "pint.Quantity":
+        if _is_measurement(self._magnitude, self._error):
+            return get_registry().Measurement(self._magnitude, self._units)
+        return get_registry().Quantity(self._magnitude, self._units)
+
+    @property
+    def value(self) -> Any:
+        return self._magnitude
+
+    @property
+    def symbol(self) -> None:
+        return None
+
+    @property
+    def left_side(self) -> str:
+        return ""
+
+    @property
+    def _env(self) -> SymbolEnvironment:
+        return EMPTY
+
+    _base_symbols = _env
+
+    @property
+    def unit(self) -> str:
+        return str(self._units)
+
+    @property
+    def uncertainty(self) -> Optional[Real]:
+        return self._error
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"magnitude": self._magnitude, "units": self._units, "uncertainty": self._error}
+
+    def _new_numeric(self, value: Any, unit: "pint.Unit") -> "PhysicsData":
+        return NumericData._new(value, unit, _unit_info(unit))
+
+    def __fast(self, other: Any) -> Optional["NumericData"]:
+        if self._info is None:
+            return None
+        if isinstance(other, NumericData):
+            fast = other
+        elif isinstance(other, PhysicsDataBase):
+            if other.is_symbolic():
+                return None
+            fast = NumericData._new(other.data.magnitude, other.data.units,
+                                    _unit_info(other.data.units))
+        else:
+            fast = NumericData._new(other, _dimensionless(), _dimensionless_info())
+        if fast._info is None:
+            return None
+        return fast
+
+    def __converted(self, other: "NumericData") -> Any:
+        if other._units is self._units or other._units == self._units:
+            return other._magnitude
+        if other._info[0] != self._info[0]:
+            raise pint.DimensionalityError(self._units, other._units,
+                                           dict(self._info[0]), dict(other._info[0]))
+        return other._magnitude * (other._info[1] / self._info[1])
+
+    def __add__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__add__(other)
+        return NumericData._new(self._magnitude + self.__converted(fast), self._units, self._info)
+
+    def __radd__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__radd__(other)
+        return NumericData._new(fast._magnitude + fast.__converted(self), fast._units, fast._info)
+
+    def __sub__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__sub__(other)
+        return NumericData._new(self._magnitude - self.__converted(fast), self._units, self._info)
+
+    def __rsub__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__rsub__(other)
+        return NumericData._new(fast._magnitude - fast.__converted(self), fast._units, fast._info)
+
+    def __mul__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__mul__(other)
+        units, info = _multiply_units(self._units, fast._units, self._info, fast._info)
+        return NumericData._new(self._magnitude * fast._magnitude, units, info)
+
+    def __rmul__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__rmul__(other)
+        units, info = _multiply_units(fast._units, self._units, fast._info, self._info)
+        return NumericData._new(fast._magnitude * self._magnitude, units, info)
+
+    def __truediv__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__truediv__(other)
+        units, info = _divide_units(self._units, fast._units, self._info, fast._info)
+        return NumericData._new(self._magnitude / fast._magnitude, units, info)
+
+    def __rtruediv__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__rtruediv__(other)
+        units, info = _divide_units(fast._units, self._units, fast._info, self._info)
+        return NumericData._new(fast._magnitude / self._magnitude, units, info)
+
+    def __floordiv__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__floordiv__(other)
+        units, info = _divide_units(self._units, fast._units, self._info, fast._info)
+        return NumericData._new(self._magnitude // fast._magnitude, units, info)
+
+    def __rfloordiv__(self, other: Any) -> "PhysicsData":
+        fast = self.__fast(other)
+        if fast is None:
+            return super().__rfloordiv__(other)
+        units, info = _divide_units(fast._units, self._units, fast._info, self._info)
+        return NumericData._new(fast._magnitude // self._magnitude, units, info)
+
+    def __pow__(self, n: Union[int, float]) -> "PhysicsData":
+        fast = self.__fast(n)
+        if fast is None or fast._info != _dimensionless_info() or fast._error is not None \
+                or not isinstance(fast._magnitude, (int, float)):
+            return super().__pow__(n)
+        units, info = _power_units(self._units, self._info, fast._magnitude)
+        return NumericData._new(self._magnitude ** fast._magnitude, units, info)
+
+    def unit_to(self, unit: str) -> "NumericData":
+        units = as_units(unit)
+        conversion = _conversion(self._units, units)
+        if conversion is None:
+            new_data = self.data.to(units)
+            return NumericData(new_data.magnitude, new_data.units)
+
+        new_data = NumericData._new(_convert(self._magnitude, conversion), units,
+                                    _unit_info(units))
+        if self._error is not None:
+            new_data._error = self._error * abs(conversion[0])
+        return new_data
+
+
+@functools.lru_cache(maxsize=1024)
+@profiling.timed("data.unit_conversion")
+def _conversion(source: "pint.Unit", target: "pint.Unit") -> Optional[tuple]:
+    """Factor and offset converting magnitudes in ``source`` into ``target``
+
+    Offset units like degC convert by a multiply-add as well. None for the
+    non-affine conversions, such as logarithmic units, left to pint.
+    Incompatible dimensions raise pint's DimensionalityError.
+    """
+    if source == target:
+        return 1, 0
+    registry = get_registry()
+    zero = registry.Quantity(0.0, source)
+    if _is_multiplicative(zero) and _is_multiplicative(registry.Quantity(0.0, target)):
+        return registry.Quantity(1.0, source).to(target).magnitude, 0
+
+    if source.dimensionality != target.dimensionality:
+        raise pint.errors.DimensionalityError(source, target, source.dimensionality,
+                                              target.dimensionality)
+    # The factor comes from the delta units, not from a difference of two conversions,
+    # so it is as exact as pint's own scale factor
+    try:
+        delta = registry.Quantity(1.0, source) - zero
+        target_delta = registry.Quantity(1.0, target) - registry.Quantity(0.0, target)
+        factor = delta.to(target_delta.units).magnitude
+    except pint.errors.PintError:
+        return None
+    offset = zero.to(target).magnitude
+    y2 = registry.Quantity(2.0, source).to(target).magnitude
+    if not numpy.isclose(y2, 2 * factor + offset, rtol=1e-12, atol=0):
+        return None
+    return factor, offset
+
+
+def _is_multiplicative(quantity: "pint.Quantity") -> bool:
+    # Older pint versions have no such check; the conversion is then verified at 2
+    check = getattr(quantity, "_ok_for_muldiv", None)
+    return True if check is None else check()
+
+
+def _convert(magnitude: Any, conversion: tuple) -> Any:
+    # One multiply and at most one add, whether the magnitude is a scalar or an array
+    factor, offset = conversion
+    if factor == 1 and offset == 0:
+        return magnitude
+    if isinstance(magnitude, list):
+        magnitude = numpy.asarray(magnitude)
+    if offset == 0:
+        return magnitude * factor
+    return magnitude * factor + offset
+
+
+@functools.lru_cache(maxsize=1024)
+@profiling.timed("data.unit_info")
+def _unit_info(units: "pint.Unit") -> Optional[tuple]:
+    """Sparse dimension exponent vector and SI scale factor of ``units``
+
+    None for units like degC that pint doesn't convert by a factor alone.
+    """
+    quantity = get_registry().Quantity(1.0, units)
+    if not quantity._is_multiplicative:
+        return None
+    base = quantity.to_base_units()
+    return tuple(sorted(base.dimensionality.items())), base.magnitude
+
+
+@functools.lru_cache(maxsize=1024)
+def _multiply_units(units1: "pint.Unit", units2: "pint.Unit",
+                    info1: Optional[tuple], info2: Optional[tuple]) -> tuple:
+    return units1 * units2, _scaled_info(info1, info2, 1)
+
+
+@functools.lru_cache(maxsize=1024)
+def _divide_units(units1: "pint.Unit", units2: "pint.Unit",
+                  info1: Optional[tuple], info2: Optional[tuple]) -> tuple:
+    return units1 / units2, _scaled_info(info1, info2, -1)
+
+
+@functools.lru_cache(maxsize=1024)
+def _power_units(units: "pint.Unit", info: Optional[tuple], n: Union[int, float]) -> tuple:
+    if info is not None:
+        info = tuple((k, v * n) for k, v in info[0]), info[1] ** n
+    return units ** n, info
+
+
+def _scaled_info(info1: Optional[tuple], info2: Optional[tuple], sign: int) -> Optional[tuple]:
+    # Exponents add and scale factors multiply, so no pint conversion is needed
+    if info1 is None or info2 is None:
+        return None
+    dimensions = dict(info1[0])
+    for k, v in info2[0]:
+        dimensions[k] = dimensions.get(k, 0) + sign * v
+    dimensions = tuple(sorted((k, v) for k, v in dimensions.items() if v != 0))
+    return dimensions, info1[1] * info2[1] ** sign
+
+
+def _dimensionless() -> "pint.Unit":
+    return parse_units("dimensionless")
+
+
+def _dimensionless_info() -> tuple:
+    return _unit_info(_dimensionless())
+
+
+@functools.lru_cache(maxsize=256)
+@profiling.timed("data.parse_units")
+def parse_units(unit: str) -> "pint.Unit":
+    return get_registry().parse_units(unit)
+
+
+def as_units(unit: Union[str, "pint.Unit"]) -> "pint.Unit":
+    if isinstance(unit, str):
+        return parse_units(unit)
+    return unit
+
+
+def _is_basic(obj: Any) -> bool:
+    # Plain numeric data never needs sympy to be imported
+    if obj is None or isinstance(obj, (str, int, float, complex)):
+        return False
+    return isinstance(obj, sympy.Basic)
+
+
+def _is_measurement(value: Any, uncertainty: Any) -> bool:
+    # pint Measurement only supports scalars, so array uncertainties stay beside the data
+    if uncertainty is None or numpy.ndim(uncertainty) > 0 or numpy.ndim(value) > 0:
+        return False
+    return bool(uncertainty)
+
+
+def _plus_minus(data: "pint.Quantity", uncertainty: Any) -> "pint.Quantity":
+    if _is_measurement(data.magnitude, uncertainty):
+        return data.plus_minus(uncertainty)
+    return data
+
+
 def as_physicsdata(obj, symbol=None) -> PhysicsData:
-    if not isinstance(obj, PhysicsData):
+    if not isinstance(obj, PhysicsDataBase):
         obj = PhysicsData(obj, "dimensionless", symbol=symbol)
     return obj
@@ -0,0 +1,94 @@
+from collections.abc import Mapping
+from typing import Any, Collection, Dict, Iterator, Optional, Tuple
+
+
+class SymbolEnvironment(Mapping):
+    """Immutable mapping from base symbol names to their pint quantities
+
+    Merging two environments only records both as parents, so each arithmetic
+    operation allocates O(1). The flat mapping is built on first lookup, with
+    the later parent winning when a name is bound twice.
+    """
+
+    __slots__ = ("_local", "_parents", "_flat")
+
+    def __init__(self, local: Optional[Mapping] = None,
+                 parents: Tuple["SymbolEnvironment", ...] = ()) -> None:
+        self._local = dict(local) if local else {}
+        self._parents = parents
+        self._flat = None if parents else self._local
+
+    @classmethod
+    def coerce(cls, obj: Optional[Mapping]) -> "SymbolEnvironment":
+        if isinstance(obj, cls):
+            return obj
+        if not obj:
+            return EMPTY
+        return cls(obj)
+
+    def merge(self, other: "SymbolEnvironment") -> "SymbolEnvironment":
+        if other is self or other.is_empty():
+            return self
+        if self.is_empty():
+            return other
+        return SymbolEnvironment(parents=(self, other))
+
+    def with_symbol(self, name: str, data: Any) -> "SymbolEnvironment":
+        if name in self:
+            return self
+        return self.merge(SymbolEnvironment({name: data}))
+
+    def restrict(self, names: Collection[str]) -> "SymbolEnvironment":
+        flat = self._flatten()
+        if all(k in names for k in flat):
+            return self
+        return SymbolEnvironment({k: v for k, v in flat.items() if k in names})
+
+    def is_empty(self) -> bool:
+        return not self._parents and not self._local
+
+    def _flatten(self) -> Dict[str, Any]:
+        if self._flat is not None:
+            return self._flat
+
+        flat = {}
+        visited = set()
+        stack = [self]
+        while stack:
+            env = stack.pop()
+            if id(env) in visited:
+                continue
+            visited.add(id(env))
+            if env._flat is not None:
+                flat.update(env._flat)
+                continue
+            # Parents are pushed in reverse so they are applied left to right.
+            stack.append(_LocalBindings(env._local))
+            stack.extend(reversed(env._parents))
+        self._flat = flat
+        return flat
+
+    def __getitem__(self, key: str) -> Any:
+        return self._flatten()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._flatten())
+
+    def __len__(self) -> int:
+        return len(self._flatten())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._flatten()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._flatten()!r})"
+
+
+class _LocalBindings:
+    __slots__ = ("_flat",)
+
+    def __init__(self, local: Dict[str, Any]) -> None:
+        self._flat = local
+
+
+EMPTY = SymbolEnvironment()
@@ -0,0 +1,111 @@
+import ast
+from typing import Any, Mapping
+
+from ueca import symbolf
+from ueca.data import as_physicsdata, PhysicsData
+from ueca.lazy import lazy_import
+
+
+sympy = lazy_import("sympy")
+
+_FUNCTIONS = {name: getattr(symbolf, name)
+              for name in ["exp", "log", "sin", "cos", "tan", "asin", "acos", "atan",
+                           "sinh", "cosh", "tanh", "asinh", "acosh", "atanh"]}
+_FORMULA_FUNCTIONS = frozenset(_FUNCTIONS) | {"sqrt"}
+_FORMULA_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+                  ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.UAdd, ast.USub)
+
+
+def parse_formula(text: str, namespace: Mapping[str, PhysicsData]) -> PhysicsData:
+    """Build a PhysicsData from a formula like ``4*pi**2*L/T**2`` over ``namespace``
+
+    The formula is parsed by sympy and rebuilt with the PhysicsData operators
+    and ``ueca.symbolf`` functions, so units are checked as usual. Only
+    numbers, names, arithmetic operators and calls of those functions are
+    accepted, and sympy evaluates it without Python's builtins.
+    """
+    _check_formula(text)
+    local_dict = {k: sympy.Symbol(k) for k in namespace}
+    global_dict = {"__builtins__": {}, "Symbol": sympy.Symbol, "Integer": sympy.Integer,
+                   "Float": sympy.Float, "Rational": sympy.Rational, "pi": sympy.pi,
+                   "E": sympy.E, "sqrt": sympy.sqrt,
+                   **{k: getattr(sympy, k) for k in _FUNCTIONS}}
+    try:
+        expr = sympy.parse_expr(text, local_dict=local_dict, global_dict=global_dict)
+    except (SyntaxError, TypeError) as e:
+        raise ValueError(f"Invalid formula: '{text}'") from e
+    # A constant formula rebuilds into a plain number
+    return as_physicsdata(_rebuild(expr, namespace))
+
+
+def _check_formula(text: str) -> None:
+    # sympy evaluates the formula as Python code, so anything that could reach
+    # other objects, such as attributes, subscripts or strings, is refused first
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid formula: '{text}'") from e
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords \
+                    or node.func.id not in _FORMULA_FUNCTIONS:
+                raise ValueError(f"Unsupported function call in the formula: '{text}'")
+        elif not isinstance(node, _FORMULA_NODES) and not _is_number(node):
+            raise ValueError(f"Unsupported syntax in the formula: '{text}'")
+
+
+def _is_number(node: "ast.AST") -> bool:
+    try:
+        value = ast.literal_eval(node)
+    except ValueError:
+        return False
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _rebuild(expr: "sympy.Basic", namespace: Mapping[str, PhysicsData]) -> Any:
+    if isinstance(expr, sympy.Symbol):
+        if expr.name not in namespace:
+            raise ValueError(f"Unknown name in the formula: '{expr.name}'")
+        return namespace[expr.name]
+    if isinstance(expr, (sympy.Number, sympy.NumberSymbol)):
+        return _rebuild_number(expr)
+
+    if isinstance(expr, sympy.Add):
+        terms = [_rebuild(arg, namespace) for arg in expr.args]
+        return sum(terms[1:], terms[0])
+    if isinstance(expr, sympy.Mul):
+        factors = [_rebuild(arg, namespace) for arg in expr.args]
+        product = factors[0]
+        for factor in factors[1:]:
+            product = product * factor
+        return product
+    if isinstance(expr, sympy.Pow):
+        return _rebuild_power(_rebuild(expr.base, namespace), expr)
+    if isinstance(expr, sympy.exp):
+        return symbolf.exp(_rebuild(expr.args[0], namespace))
+    if isinstance(expr, sympy.Function) and expr.func.__name__ in _FUNCTIONS:
+        return _FUNCTIONS[expr.func.__name__](_rebuild(expr.args[0], namespace))
+    raise ValueError(f"Unsupported expression in the formula: '{expr}'")
+
+
+def _rebuild_number(expr: "sympy.Basic") -> Any:
+    if isinstance(expr, sympy.Integer):
+        return int(expr)
+    if isinstance(expr, sympy.Rational):
+        return symbolf.Rational(expr.p, expr.q)
+    if isinstance(expr, sympy.Float):
+        return float(expr)
+    if isinstance(expr, sympy.NumberSymbol):
+        return PhysicsData(None, "dimensionless", symbol=expr)
+    raise ValueError(f"Unsupported number in the formula: '{expr}'")
+
+
+def _rebuild_power(base: Any, expr: "sympy.Pow") -> Any:
+    exponent = expr.exp
+    if isinstance(exponent, sympy.Rational) and exponent.q == 2:
+        return symbolf.sqrt(base ** int(exponent.p), apply_dim=True)
+    if isinstance(exponent, sympy.Integer):
+        return base ** int(exponent)
+    if isinstance(exponent, sympy.Float):
+        return base ** float(exponent)
+    raise ValueError(f"Only numeric exponents are supported: '{expr}'")
@@ -0,0 +1,190 @@
+import csv
+import itertools
+import os
+import re
+from typing import Dict, IO, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy
+
+from ueca.data import NumericData, _conversion, as_units, get_registry
+from ueca.lazy import lazy_import
+
+
+pint = lazy_import("pint")
+
+
+_HEADER_PATTERN = re.compile(r"^\s*(?P<name>.*?)\s*(?:\[(?P<unit>[^\]]*)\])?\s*$")
+
+
+def parse_header(field: str) -> Tuple[str, Optional[str]]:
+    """Split a header field like ``length [mm]`` into its name and unit"""
+    match = _HEADER_PATTERN.match(field)
+    unit = match.group("unit")
+    if unit is not None:
+        unit = unit.strip() or None
+    return match.group("name"), unit
+
+
+def iter_csv(file: Union[str, "os.PathLike", IO[str]],
+             units: Optional[Mapping[str, str]] = None,
+             uncertainties: Optional[Mapping[str, Union[str, float]]] = None,
+             columns: Optional[Sequence[str]] = None, chunk_size: int = 100000,
+             delimiter: str = ",", comments: str = "#",
+             encoding: str = "utf-8") -> Iterator[Dict[str, NumericData]]:
+    """Read a measurement table chunk by chunk, one NumericData array per column
+
+    The first row is the header. A field like ``length [mm]`` gives the unit of
+    the column, and ``units`` overrides or completes it. ``uncertainties`` maps
+    a column to the column holding its standard uncertainty, converted to the
+    unit of the values, or to a constant uncertainty. At most ``chunk_size``
+    rows are held in memory at once.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive: '{chunk_size}'")
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, encoding=encoding, newline="") as f:
+            yield from iter_csv(f, units=units, uncertainties=uncertainties,
+                                columns=columns, chunk_size=chunk_size,
+                                delimiter=delimiter, comments=comments)
+        return
+
+    lines = _records(file, comments)
+    header = next(csv.reader(itertools.islice(lines, 1), delimiter=delimiter), None)
+    if header is None:
+        raise ValueError("The file doesn't have a header")
+
+    plan = _plan_columns(header, units or {}, uncertainties or {}, columns)
+    usecols = sorted({i for _, index, _, error_index, _ in plan
+                      for i in (index, error_index) if i is not None})
+    positions = {k: j for j, k in enumerate(usecols)}
+
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        if any('"' in record for record in chunk):
+            # Quoted fields may hold delimiters, newlines or comment characters
+            rows = csv.reader(chunk, delimiter=delimiter)
+            table = numpy.array([[row[i] for i in usecols] for row in rows], dtype=float,
+                                ndmin=2)
+        else:
+            table = numpy.loadtxt(chunk, delimiter=delimiter, comments=comments,
+                                  usecols=usecols, ndmin=2, dtype=float)
+        chunk_data = {}
+        for name, index, unit, error_index, error in plan:
+            if error_index is not None:
+                # ``error`` is the factor converting the uncertainty column into ``unit``,
+                # or the units to convert it from with pint
+                column = table[:, positions[error_index]]
+                if isinstance(error, tuple):
+                    error = get_registry().Quantity(column, error[0]).to(error[1]).magnitude
+                else:
+                    error = column * error
+            chunk_data[name] = NumericData(table[:, positions[index]], unit, uncertainty=error)
+        yield chunk_data
+
+
+def read_csv(file: Union[str, "os.PathLike", IO[str]],
+             units: Optional[Mapping[str, str]] = None,
+             uncertainties: Optional[Mapping[str, Union[str, float]]] = None,
+             columns: Optional[Sequence[str]] = None, chunk_size: int = 100000,
+             delimiter: str = ",", comments: str = "#",
+             encoding: str = "utf-8") -> Dict[str, NumericData]:
+    """Read a whole measurement table, one NumericData array per column
+
+    Takes the arguments of ``iter_csv``, whose chunks are concatenated.
+    """
+    values = {}
+    errors = {}
+    output_units = {}
+    for chunk in iter_csv(file, units=units, uncertainties=uncertainties, columns=columns,
+                          chunk_size=chunk_size, delimiter=delimiter, comments=comments,
+                          encoding=encoding):
+        for name, data in chunk.items():
+            values.setdefault(name, []).append(data.value)
+            errors.setdefault(name, []).append(data.uncertainty)
+            output_units[name] = data.unit
+
+    if not values:
+        raise ValueError("The file doesn't have any row")
+
+    output = {}
+    for name, chunks in values.items():
+        error = errors[name]
+        if error[0] is None or numpy.ndim(error[0]) == 0:
+            error = error[0]
+        else:
+            error = numpy.concatenate(error)
+        output[name] = NumericData(numpy.concatenate(chunks), output_units[name],
+                                   uncertainty=error)
+    return output
+
+
+def _records(file: IO[str], comments: str) -> Iterator[str]:
+    """Lines of ``file`` grouped into CSV records, without blank and comment records
+
+    A record is a comment when its first line starts with ``comments``;
+    the lines continuing a quoted field are never taken for comments.
+    """
+    record = ""
+    for line in file:
+        if not record and (not line.strip() or line.lstrip().startswith(comments)):
+            continue
+        record += line
+        # An odd number of quotes leaves a quoted field open on the next line
+        if record.count('"') % 2 == 0:
+            yield record
+            record = ""
+    if record:
+        yield record
+
+
+def _plan_columns(header: Sequence[str], units: Mapping[str, str],
+                  uncertainties: Mapping[str, Union[str, float]],
+                  columns: Optional[Sequence[str]]) -> List[tuple]:
+    names = []
+    header_units = {}
+    for field in header:
+        name, unit = parse_header(field)
+        if name in header_units:
+            raise ValueError(f"The column is duplicated: '{name}'")
+        names.append(name)
+        header_units[name] = unit
+    indices = {k: i for i, k in enumerate(names)}
+
+    for name in list(units) + list(uncertainties):
+        if name not in indices:
+            raise ValueError(f"The file don't include the column: '{name}'")
+
+    error_columns = {v for v in uncertainties.values() if isinstance(v, str)}
+    if columns is None:
+        columns = [k for k in names if k not in error_columns]
+
+    plan = []
+    for name in columns:
+        if name not in indices:
+            raise ValueError(f"The file don't include the column: '{name}'")
+        unit = as_units(units.get(name) or header_units[name] or "dimensionless")
+
+        error = uncertainties.get(name)
+        if isinstance(error, str):
+            if error not in indices:
+                raise ValueError(f"The file don't include the column: '{error}'")
+            error_unit = units.get(error) or header_units[error]
+            plan.append((name, indices[name], unit, indices[error],
+                         _error_conversion(error_unit, unit)))
+        else:
+            plan.append((name, indices[name], unit, None, error))
+    return plan
+
+
+def _error_conversion(error_unit: Optional[str], unit: "pint.Unit") -> Union[float, tuple]:
+    if error_unit is None:
+        return 1
+    # An uncertainty is a difference, so the offset of units like degC doesn't apply
+    conversion = _conversion(as_units(error_unit), unit)
+    if conversion is None:
+        # Non-affine units like dB have no factor; pint converts the column itself
+        return as_units(error_unit), unit
+    return conversion[0]
@@ -1,16 +1,21 @@
 import contextlib
+from typing import Any
 
 from sympy.printing.conventions import split_super_sub
-from sympy.printing.latex import translate
+from sympy.printing.latex import LatexPrinter, translate
 
+from ueca import profiling
+from ueca.cache import CacheInfo, LRUCache
 
-@contextlib.contextmanager
-def translate_space_latex():
-    from sympy.printing.latex import LatexPrinter
 
-    _deal_with_super_sub = LatexPrinter._deal_with_super_sub
+class SpaceLatexPrinter(LatexPrinter):
+    """LatexPrinter translating every space separated word of a symbol name
 
-    def _deal_with_super_sub_expanded(self, string, style="plain"):
+    ``Symbol("Delta lambda")`` is printed as ``\\Delta \\lambda``. Being a subclass,
+    it leaves sympy's own printer untouched and is safe to use from many threads.
+    """
+
+    def _deal_with_super_sub(self, string, style="plain"):
         """
         This function is expansion of _deal_with_super_sub (LatexPrinter's method)
 
@@ -42,7 +47,36 @@ def translate_space_latex():
 
         return name
 
-    LatexPrinter._deal_with_super_sub = _deal_with_super_sub_expanded
+
+_latex_strings = LRUCache(maxsize=1024)
+
+
+def latex(expr: Any, **settings: Any) -> str:
+    key = (expr, tuple(sorted(settings.items())))
+    return _latex_strings.get_or_create(key, lambda: _print(expr, settings))
+
+
+@profiling.timed("latex.print")
+def _print(expr: Any, settings: dict) -> str:
+    return SpaceLatexPrinter(settings).doprint(expr)
+
+
+def cache_info() -> CacheInfo:
+    return _latex_strings.info()
+
+
+def clear_cache() -> None:
+    _latex_strings.clear()
+
+
+@contextlib.contextmanager
+def translate_space_latex():
+    """Make ``sympy.latex`` itself print like ``SpaceLatexPrinter``
+
+    This patches ``LatexPrinter`` for every thread; prefer ``latex``.
+    """
+    _deal_with_super_sub = LatexPrinter._deal_with_super_sub
+    LatexPrinter._deal_with_super_sub = SpaceLatexPrinter._deal_with_super_sub
 
     try:
         yield
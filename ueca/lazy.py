@@ -0,0 +1,46 @@
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a heavy third-party module, imported on the first attribute access
+
+    The stand-in is never put into ``sys.modules``, so a plain ``import`` of the
+    module elsewhere is unaffected. The first import is guarded by a lock, and
+    every attribute looked up is kept on the stand-in, so later lookups don't
+    go through ``__getattr__`` again.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__lock = threading.Lock()
+        self.__module = None
+
+    def __getattr__(self, attr: str) -> Any:
+        module = self.__module
+        if module is None:
+            with self.__lock:
+                if self.__module is None:
+                    self.__module = importlib.import_module(self.__name__)
+                module = self.__module
+        value = getattr(module, attr)
+        setattr(self, attr, value)
+        return value
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return the module ``name``, imported on the first attribute access
+
+    Only meant for heavy third-party modules such as pint, sympy or scipy;
+    modules of this package are imported normally.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return LazyModule(name)
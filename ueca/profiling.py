@@ -0,0 +1,135 @@
+import atexit
+import contextlib
+import functools
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, TextIO
+
+
+class PhaseStats(NamedTuple):
+    calls: int
+    total: float
+
+
+_enabled = os.environ.get("UECA_PROFILE", "") not in ("", "0")
+_lock = threading.Lock()
+_counters = {}
+_hooks = []
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+
+
+def add_hook(hook: Callable[[str, float], None]) -> None:
+    """Call ``hook(phase, seconds)`` whenever a phase is recorded, e.g. to export metrics"""
+    with _lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[str, float], None]) -> None:
+    with _lock:
+        _hooks.remove(hook)
+
+
+def record(phase: str, seconds: float) -> None:
+    with _lock:
+        counter = _counters.get(phase)
+        if counter is None:
+            counter = _counters[phase] = [0, 0.0]
+        counter[0] += 1
+        counter[1] += seconds
+        hooks = list(_hooks)
+    for hook in hooks:
+        hook(phase, seconds)
+
+
+def timed(phase: str) -> Callable[[Callable], Callable]:
+    """Decorator recording the calls and cumulative time of a function as ``phase``
+
+    While profiling is disabled the only cost is one flag check per call.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(phase, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record the block as the phase ``name``, e.g. a step of a user's own script"""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+@contextlib.contextmanager
+def profile(clear: bool = True) -> Iterator[None]:
+    """Record every phase inside the block, then restore the previous state"""
+    global _enabled
+    previous = _enabled
+    if clear:
+        reset()
+    _enabled = True
+    try:
+        yield
+    finally:
+        _enabled = previous
+
+
+def stats() -> Dict[str, PhaseStats]:
+    with _lock:
+        return {phase: PhaseStats(*counter) for phase, counter in _counters.items()}
+
+
+def report() -> str:
+    rows = sorted(stats().items(), key=lambda item: item[1].total, reverse=True)
+    lines = [f"{'phase':<40} {'calls':>10} {'total [ms]':>12} {'mean [us]':>12}"]
+    for phase, (calls, total) in rows:
+        lines.append(f"{phase:<40} {calls:>10} {total * 1e3:>12.3f} "
+                     f"{total / calls * 1e6:>12.3f}")
+    return "\n".join(lines)
+
+
+def dump(file: Optional[TextIO] = None) -> None:
+    print(report(), file=file or sys.stderr)
+
+
+def _dump_at_exit() -> None:
+    if _counters:
+        dump()
+
+
+if _enabled:
+    # UECA_PROFILE profiles a whole run and prints the report when it ends
+    atexit.register(_dump_at_exit)
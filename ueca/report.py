@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+from concurrent.futures import Executor
+from typing import Dict, Optional, Tuple, Union
+
+from ueca import latex
+from ueca.cache import CacheInfo, LRUCache
+from ueca.data import PhysicsData
+from ueca.lazy import lazy_import
+from ueca.serialize import srepr, to_dict
+from ueca.uncertainty import _map
+
+
+sympy = lazy_import("sympy")
+
+PREAMBLE = "\\documentclass{article}\n\\usepackage{amsmath}\n\\begin{document}\n"
+POSTAMBLE = "\\end{document}\n"
+
+
+class Report:
+    """LaTeX document of named quantities, re-rendering only the equations that changed
+
+    Each equation is cached under a hash of its expression, values, unit and
+    flags, so rebuilding after one reading changed prints only the equations
+    depending on it. With ``cache_file`` the rendered equations are kept on
+    disk between runs as well. At most ``cache_size`` rendered equations are
+    kept in memory.
+    """
+
+    def __init__(self, cache_file: Optional[Union[str, "os.PathLike"]] = None,
+                 preamble: str = PREAMBLE, postamble: str = POSTAMBLE,
+                 cache_size: int = 1024) -> None:
+        self.cache_file = cache_file
+        self.preamble = preamble
+        self.postamble = postamble
+        self._entries = {}
+        self._fragments = LRUCache(maxsize=cache_size)
+        if cache_file is not None and os.path.exists(cache_file):
+            self.__load_cache()
+
+    def add(self, name: str, data: PhysicsData, force_value: bool = False,
+            symbolic_unit: bool = True, left_side: Optional[str] = None) -> None:
+        """Add or replace the equation ``name``
+
+        Its left side is ``left_side``, the ``left_side`` of ``data`` or else
+        ``name`` printed as a symbol.
+        """
+        if not isinstance(data, PhysicsData):
+            raise TypeError(f"The type of '{data.__class__.__name__}' isn't 'PhysicsData'")
+        self._entries[name] = (data, force_value, symbolic_unit, left_side)
+
+    def remove(self, name: str) -> None:
+        del self._entries[name]
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._entries)
+
+    def fragments(self, parallel: bool = False, executor: Optional[Executor] = None,
+                  max_workers: Optional[int] = None) -> Dict[str, str]:
+        """Rendered equation of each name, rendering the uncached ones
+
+        With ``parallel=True`` they are rendered on a process pool of
+        ``max_workers`` processes, or on ``executor`` when it is given.
+        """
+        return self.__render(parallel, executor, max_workers)[1]
+
+    def __render(self, parallel: bool, executor: Optional[Executor],
+                 max_workers: Optional[int]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        # The key holds the left side as printed, which may come from the name
+        entries = {name: self.__task(name) for name in self._entries}
+        keys = {name: _fragment_key(*task) for name, task in entries.items()}
+        texts = {}
+        tasks = {}
+        for name, key in keys.items():
+            text = self._fragments.get(key)
+            if text is None:
+                tasks.setdefault(key, entries[name])
+            else:
+                texts[key] = text
+
+        rendered = _map(_render, list(tasks.values()), parallel, executor, max_workers)
+
+        for key, text in zip(tasks, rendered):
+            self._fragments.set(key, text)
+            texts[key] = text
+        return keys, {name: texts[key] for name, key in keys.items()}
+
+    def __task(self, name: str) -> Tuple[PhysicsData, bool, bool, str]:
+        data, force_value, symbolic_unit, left_side = self._entries[name]
+        if left_side is None:
+            left_side = data.left_side or latex.latex(sympy.Symbol(name))
+        return data, force_value, symbolic_unit, left_side
+
+    def to_latex(self, parallel: bool = False, executor: Optional[Executor] = None,
+                 max_workers: Optional[int] = None) -> str:
+        keys, fragments = self.__render(parallel, executor, max_workers)
+        body = "".join(f"% {name}\n\\begin{{equation*}}\n    {text}\n\\end{{equation*}}\n"
+                       for name, text in fragments.items())
+        if self.cache_file is not None:
+            # Only the current equations are kept, so the file doesn't grow forever
+            self.__save_cache({keys[name]: text for name, text in fragments.items()})
+        return self.preamble + body + self.postamble
+
+    def write(self, path: Union[str, "os.PathLike"], parallel: bool = False,
+              executor: Optional[Executor] = None, max_workers: Optional[int] = None) -> None:
+        text = self.to_latex(parallel=parallel, executor=executor, max_workers=max_workers)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def cache_info(self) -> CacheInfo:
+        return self._fragments.info()
+
+    def __load_cache(self) -> None:
+        with open(self.cache_file, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") == _CACHE_VERSION:
+            for key, text in state["fragments"].items():
+                self._fragments.set(key, text)
+
+    def __save_cache(self, fragments: Dict[str, str]) -> None:
+        path = os.fspath(self.cache_file)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"version": _CACHE_VERSION, "fragments": fragments}, f)
+        os.replace(temporary, path)
+
+
+_CACHE_VERSION = 1
+
+
+def _fragment_key(data: PhysicsData, force_value: bool, symbolic_unit: bool,
+                  left_side: str) -> str:
+    if data.is_symbolic() and not force_value:
+        # Only the expression and the unit are printed, so the values don't matter
+        state = [srepr(data.symbol), data.unit, data.left_side]
+    else:
+        state = to_dict(data)
+    content = [state, force_value, symbolic_unit, left_side]
+    text = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _render(data: PhysicsData, force_value: bool, symbolic_unit: bool,
+            left_side: str) -> str:
+    # The left side is chosen by the report, so that of ``data`` isn't printed as well
+    text = data._latex_right_side(force_value=force_value, symbolic_unit=symbolic_unit)
+    if left_side:
+        text = f"{left_side} = {text}"
+    return text
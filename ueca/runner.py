@@ -0,0 +1,370 @@
+import contextlib
+import json
+import os
+import tempfile
+from concurrent.futures import as_completed, Executor, ProcessPoolExecutor
+from typing import (Any, Callable, Dict, IO, Iterator, List, Mapping, NamedTuple, Optional, Set,
+                    Tuple, Union)
+
+import numpy
+
+from ueca import latex
+from ueca.cache import digest
+from ueca.data import PhysicsData
+from ueca.formula import parse_formula
+from ueca.io import iter_csv
+from ueca.lazy import lazy_import
+from ueca.report import Report
+from ueca.uncertainty import default_max_workers, UncertaintyPropagation
+
+
+pint = lazy_import("pint")
+sympy = lazy_import("sympy")
+
+FORMATS = ("csv", "json", "latex")
+DEFAULT_CHUNK_SIZE = 100000
+
+
+class ExperimentResult(NamedTuple):
+    name: str
+    rows: Optional[int]
+    skipped: bool
+    outputs: List[str]
+    error: Optional[str] = None
+
+
+def load_spec(path: Union[str, "os.PathLike"]) -> Dict[str, Any]:
+    """Read a JSON, TOML or YAML spec, resolving its paths against its directory
+
+    Top-level ``inputs``, ``quantities``, ``units`` and ``uncertainties`` are
+    defaults which every entry of ``experiments`` extends or overrides.
+    """
+    path = os.fspath(path)
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in _LOADERS:
+        raise ValueError(f"Unsupported spec format: '{suffix}'")
+    with open(path, "rb") as f:
+        spec = _LOADERS[suffix](f)
+    if not isinstance(spec, dict):
+        raise ValueError("The spec must be a mapping")
+    return normalize_spec(spec, os.path.dirname(os.path.abspath(path)))
+
+
+def normalize_spec(spec: Mapping[str, Any], base_dir: str = ".") -> Dict[str, Any]:
+    experiments = spec.get("experiments")
+    if not experiments:
+        raise ValueError("The spec doesn't have any experiment")
+
+    formats = spec.get("formats", ["csv", "json"])
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported output format: '{fmt}'")
+
+    names = set()
+    normalized = []
+    for experiment in experiments:
+        name = experiment.get("name")
+        if not name or name in names or os.sep in name:
+            raise ValueError(f"Each experiment needs a unique file name: '{name}'")
+        names.add(name)
+
+        merged = {"name": name, "data": experiment.get("data")}
+        for key in ["inputs", "quantities", "units", "uncertainties"]:
+            merged[key] = {**spec.get(key, {}), **experiment.get(key, {})}
+        if not merged["quantities"]:
+            raise ValueError(f"The experiment doesn't have any quantity: '{name}'")
+        if merged["data"] is not None:
+            merged["data"] = os.path.join(base_dir, merged["data"])
+        normalized.append(merged)
+
+    return {"output": os.path.join(base_dir, spec.get("output", "results")),
+            "formats": list(formats),
+            "chunk_size": int(spec.get("chunk_size", DEFAULT_CHUNK_SIZE)),
+            "workers": spec.get("workers"),
+            "experiments": normalized}
+
+
+def run(spec: Mapping[str, Any], workers: Optional[int] = None, executor: Optional[Executor] = None,
+        force: bool = False,
+        progress: Optional[Callable[[int, int, ExperimentResult], None]] = None,
+        keep_going: bool = False) -> List[ExperimentResult]:
+    """Run every experiment of a normalized spec, one per worker process
+
+    Experiments whose outputs are already up to date are skipped unless
+    ``force``. ``progress(done, total, result)`` is called as each one ends.
+    With ``keep_going`` an experiment failing on its files, units or formulas
+    doesn't stop the others, and its result holds the error message.
+    """
+    experiments = spec["experiments"]
+    args = [(experiment, spec["output"], spec["formats"], spec["chunk_size"], force)
+            for experiment in experiments]
+    workers = workers or spec.get("workers") or default_max_workers(len(experiments))
+
+    results = {}
+    if executor is None and workers == 1:
+        for i, arg in enumerate(args):
+            results[i] = _result(lambda: run_experiment(*arg), arg[0]["name"], keep_going)
+            if progress is not None:
+                progress(len(results), len(args), results[i])
+    else:
+        with contextlib.ExitStack() as stack:
+            if executor is None:
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            futures = {executor.submit(run_experiment, *arg): i for i, arg in enumerate(args)}
+            for future in as_completed(futures):
+                results[futures[future]] = _result(
+                    future.result, experiments[futures[future]]["name"], keep_going)
+                if progress is not None:
+                    progress(len(results), len(args), results[futures[future]])
+    return [results[i] for i in range(len(args))]
+
+
+def _result(call: Callable[[], ExperimentResult], name: str,
+            keep_going: bool) -> ExperimentResult:
+    try:
+        return call()
+    except (OSError, ValueError, TypeError, pint.errors.PintError) as e:
+        if not keep_going:
+            raise
+        return ExperimentResult(name, None, False, [], str(e))
+
+
+def run_experiment(experiment: Mapping[str, Any], output: str, formats: List[str],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, force: bool = False) -> ExperimentResult:
+    """Evaluate the quantities of one experiment and write its outputs
+
+    The JSON summary is written last and records a digest of the experiment,
+    its data file and the formats, so an interrupted run resumes where it
+    stopped.
+    """
+    name = experiment["name"]
+    os.makedirs(output, exist_ok=True)
+    paths = {"csv": os.path.join(output, f"{name}.csv"),
+             "json": os.path.join(output, f"{name}.json"),
+             "latex": os.path.join(output, f"{name}.tex")}
+    outputs = [paths[fmt] for fmt in formats]
+    key = _experiment_digest(experiment, formats)
+
+    if not force and _is_up_to_date(paths["json"], key, outputs):
+        with open(paths["json"], encoding="utf-8") as f:
+            return ExperimentResult(name, json.load(f)["rows"], True, outputs)
+
+    namespace, measured, chunks = _resolve_inputs(experiment, chunk_size)
+    quantities = _resolve_quantities(experiment, namespace)
+    propagations = {}
+    for quantity, data in quantities.items():
+        symbols = [k for k in data._base_symbols if k in measured]
+        propagations[quantity] = UncertaintyPropagation(data, symbols=symbols, use_cancel=False)
+
+    summary = {"name": name, "digest": key, "rows": None, "quantities": {}}
+    for quantity, data in quantities.items():
+        summary["quantities"][quantity] = {"unit": data.unit, "formula": str(data.symbol)}
+
+    csv_path = paths["csv"] if "csv" in formats else os.devnull
+    if chunks is None:
+        _evaluate_scalars(propagations, summary, csv_path)
+    else:
+        _evaluate_table(chunks, propagations, summary, csv_path)
+    if "latex" in formats:
+        _write_latex(paths["latex"], quantities, summary)
+
+    # The summary is the marker of a finished experiment, so it is written last
+    with _atomic_write(paths["json"]) as f:
+        json.dump(summary, f, indent=2)
+    return ExperimentResult(name, summary["rows"], False, outputs)
+
+
+def _resolve_inputs(experiment: Mapping[str, Any], chunk_size: int
+                    ) -> Tuple[Dict[str, PhysicsData], Set[str], Optional[Iterator[dict]]]:
+    # The first row of the data stands in for each column while the formulas are built
+    namespace = {k: _input(k, v) for k, v in experiment["inputs"].items()}
+    measured = {k for k, v in namespace.items() if v.uncertainty}
+    if experiment["data"] is None:
+        return namespace, measured, None
+
+    chunks = iter_csv(experiment["data"], units=experiment["units"],
+                      uncertainties=experiment["uncertainties"], chunk_size=chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        raise ValueError(f"The data of the experiment doesn't have any row: "
+                         f"'{experiment['name']}'")
+    for column, data in first.items():
+        namespace[column] = PhysicsData(data.value[0], data.unit, symbol=column)
+        if data.uncertainty is not None:
+            measured.add(column)
+        else:
+            measured.discard(column)
+    return namespace, measured, _chained(first, chunks)
+
+
+def _resolve_quantities(experiment: Mapping[str, Any],
+                        namespace: Dict[str, PhysicsData]) -> Dict[str, PhysicsData]:
+    quantities = {}
+    for quantity, formula in experiment["quantities"].items():
+        data = parse_formula(str(formula), namespace)
+        if not data.is_symbolic():
+            raise ValueError(f"The quantity doesn't depend on any input: '{quantity}'")
+        namespace[quantity] = quantities[quantity] = data
+    return quantities
+
+
+def _evaluate_scalars(propagations: Mapping[str, UncertaintyPropagation],
+                      summary: Dict[str, Any], csv_path: str) -> None:
+    values = {}
+    for quantity, propagation in propagations.items():
+        value, error = propagation.evaluate()
+        values[quantity] = (numpy.array([float(value.value)]), numpy.array([float(error.value)]))
+        summary["quantities"][quantity].update(value=float(value.value),
+                                               uncertainty=float(error.value))
+    if csv_path != os.devnull:
+        with _atomic_write(csv_path) as f:
+            _write_csv(f, _units(summary), values, header=True)
+
+
+def _evaluate_table(chunks: Iterator[dict], propagations: Mapping[str, UncertaintyPropagation],
+                    summary: Dict[str, Any], csv_path: str) -> None:
+    statistics = {quantity: _Statistics() for quantity in propagations}
+    units = _units(summary)
+    rows = 0
+    with _atomic_write(csv_path) as f:
+        for chunk in chunks:
+            size = len(next(iter(chunk.values())).value)
+            results = {}
+            for quantity, propagation in propagations.items():
+                values = {k: chunk[k].value for k in propagation.names if k in chunk}
+                errors = {k: chunk[k].uncertainty for k in propagation.symbols if k in chunk}
+                value, error = propagation.evaluate(values, errors)
+                results[quantity] = (numpy.broadcast_to(value.value, (size,)),
+                                     numpy.broadcast_to(error.value, (size,)))
+                statistics[quantity].update(results[quantity][0])
+            _write_csv(f, units, results, header=rows == 0)
+            rows += size
+    summary["rows"] = rows
+    for quantity, stats in statistics.items():
+        summary["quantities"][quantity].update(stats.as_dict())
+
+
+def _units(summary: Mapping[str, Any]) -> Dict[str, str]:
+    return {k: v["unit"] for k, v in summary["quantities"].items()}
+
+
+def _write_latex(path: str, quantities: Mapping[str, PhysicsData],
+                 summary: Mapping[str, Any]) -> None:
+    report = Report()
+    for quantity, data in quantities.items():
+        report.add(quantity, data)
+        if summary["rows"] is None:
+            value, error = summary["quantities"][quantity]["value"], \
+                summary["quantities"][quantity]["uncertainty"]
+            report.add(f"{quantity} value", PhysicsData(value, data.unit, uncertainty=error),
+                       left_side=latex.latex(sympy.Symbol(quantity)))
+    with _atomic_write(path) as f:
+        f.write(report.to_latex())
+
+
+def _input(name: str, spec: Any) -> PhysicsData:
+    if not isinstance(spec, Mapping):
+        spec = {"value": spec}
+    if "value" not in spec:
+        raise ValueError(f"The input doesn't have a value: '{name}'")
+    return PhysicsData(spec["value"], spec.get("unit", "dimensionless"), symbol=name,
+                       uncertainty=spec.get("uncertainty"))
+
+
+def _chained(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    yield first
+    yield from rest
+
+
+class _Statistics:
+    __slots__ = ("count", "mean", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.minimum = numpy.inf
+        self.maximum = -numpy.inf
+
+    def update(self, values: "numpy.ndarray") -> None:
+        if not len(values):
+            return
+        total = self.count + len(values)
+        self.mean += (float(numpy.mean(values)) - self.mean) * len(values) / total
+        self.count = total
+        self.minimum = min(self.minimum, float(numpy.min(values)))
+        self.maximum = max(self.maximum, float(numpy.max(values)))
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"mean": self.mean, "min": self.minimum, "max": self.maximum}
+
+
+def _write_csv(f: IO[str], units: Mapping[str, str], results: Mapping[str, tuple],
+               header: bool) -> None:
+    if header:
+        f.write(",".join(f"{k} [{v}],u({k}) [{v}]" for k, v in units.items()) + "\n")
+    columns = [column for k in units for column in results[k]]
+    numpy.savetxt(f, numpy.column_stack(columns), delimiter=",", fmt="%.17g")
+
+
+@contextlib.contextmanager
+def _atomic_write(path: str) -> Iterator[IO[str]]:
+    if path == os.devnull:
+        with open(path, "w") as f:
+            yield f
+        return
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            yield f
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary)
+        raise
+
+
+def _experiment_digest(experiment: Mapping[str, Any], formats: List[str]) -> str:
+    parts = [json.dumps(experiment, sort_keys=True, default=str), ",".join(formats)]
+    if experiment["data"] is not None:
+        stat = os.stat(experiment["data"])
+        parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+    return digest(*parts)
+
+
+def _is_up_to_date(summary_path: str, key: str, outputs: List[str]) -> bool:
+    if not all(os.path.exists(path) for path in outputs):
+        return False
+    try:
+        with open(summary_path, encoding="utf-8") as f:
+            return json.load(f).get("digest") == key
+    except (OSError, ValueError):
+        return False
+
+
+def _load_json(f: IO[bytes]) -> Any:
+    return json.load(f)
+
+
+def _load_toml(f: IO[bytes]) -> Any:
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ValueError("Reading TOML specs needs Python 3.11 or the package 'tomli'")
+    return tomllib.load(f)
+
+
+def _load_yaml(f: IO[bytes]) -> Any:
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("Reading YAML specs needs the package 'PyYAML'")
+    try:
+        return yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML spec: {e}") from e
+
+
+_LOADERS = {".json": _load_json, ".toml": _load_toml, ".yaml": _load_yaml, ".yml": _load_yaml}
@@ -0,0 +1,173 @@
+import ast
+import base64
+import json
+from typing import Any, Dict, Optional, Tuple
+
+import numpy
+
+from ueca.cache import LRUCache
+from ueca.data import NumericData, PhysicsData, _plus_minus, as_units, get_registry
+from ueca.lazy import lazy_import
+
+
+pint = lazy_import("pint")
+sympy = lazy_import("sympy")
+
+FORMAT_VERSION = 1
+
+_sreprs = LRUCache(maxsize=1024)
+
+# The sympy names a stored expression may refer to; nothing else is ever called
+_SREPR_NAMES = frozenset({
+    "Symbol", "Integer", "Rational", "Float", "Tuple", "Add", "Mul", "Pow", "Abs", "sign",
+    "exp", "log", "sin", "cos", "tan", "asin", "acos", "atan", "atan2", "sinh", "cosh",
+    "tanh", "asinh", "acosh", "atanh", "Min", "Max", "Derivative",
+    "pi", "E", "I", "oo", "zoo", "nan",
+})
+
+
+def dumps(obj: PhysicsData) -> str:
+    """JSON text of ``obj`` which ``loads`` turns back into an equal PhysicsData"""
+    return json.dumps(to_dict(obj), separators=(",", ":"))
+
+
+def loads(text: str) -> PhysicsData:
+    return from_dict(json.loads(text))
+
+
+def to_dict(obj: PhysicsData) -> Dict[str, Any]:
+    """JSON-compatible form of ``obj``
+
+    Units are stored as strings, expressions in ``sympy.srepr`` form and
+    arrays as base64 of their raw bytes. Uncertainties keep their standard
+    deviations only, so correlations between separately stored values are lost.
+    """
+    state = _state(obj)
+    state["magnitude"] = _encode_array(state["magnitude"])
+    state["uncertainty"] = _encode_array(state["uncertainty"])
+    if state["symbol"] is not None and not isinstance(state["symbol"], str):
+        state["symbol"] = {"srepr": srepr(state["symbol"])}
+    state["base_symbols"] = {k: [_encode_array(m), _encode_array(e), u]
+                             for k, (m, e, u) in state["base_symbols"].items()}
+    return state
+
+
+def from_dict(state: Dict[str, Any]) -> PhysicsData:
+    state = dict(state)
+    _check_version(state)
+    state["magnitude"] = _decode_array(state["magnitude"])
+    state["uncertainty"] = _decode_array(state["uncertainty"])
+    if isinstance(state["symbol"], dict):
+        state["symbol"] = parse_srepr(state["symbol"]["srepr"])
+    state["base_symbols"] = {k: (_decode_array(m), _decode_array(e), u)
+                             for k, (m, e, u) in state["base_symbols"].items()}
+    return _from_state(state)
+
+
+def srepr(expr: "sympy.Basic") -> str:
+    """``sympy.srepr`` of ``expr``, cached since large expressions take long to print"""
+    return _sreprs.get_or_create(expr, lambda: sympy.srepr(expr))
+
+
+def parse_srepr(text: str) -> "sympy.Basic":
+    """Expression of a ``sympy.srepr`` text, rebuilt without evaluating it as code
+
+    Only literals and the sympy classes and functions in ``_SREPR_NAMES``
+    are accepted; anything else raises ValueError.
+    """
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid srepr: '{text}'") from e
+    return _rebuild(tree.body)
+
+
+def _rebuild(node: "ast.AST") -> Any:
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _SREPR_NAMES \
+                or any(k.arg is None for k in node.keywords):
+            raise ValueError(f"Unsupported call in the srepr: '{ast.dump(node.func)}'")
+        args = [_rebuild(arg) for arg in node.args]
+        kwargs = {k.arg: _rebuild(k.value) for k in node.keywords}
+        return getattr(sympy, node.func.id)(*args, **kwargs)
+    if isinstance(node, ast.Name) and node.id in _SREPR_NAMES:
+        return getattr(sympy, node.id)
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return tuple(_rebuild(element) for element in node.elts)
+    # Numbers, strings and booleans; literal_eval rejects anything else
+    return ast.literal_eval(node)
+
+
+def _state(obj: PhysicsData) -> Dict[str, Any]:
+    # Quantities are split into plain magnitudes so that nothing refers to a unit registry
+    if not isinstance(obj, PhysicsData):
+        raise TypeError(f"The type of '{obj.__class__.__name__}' isn't 'PhysicsData'")
+
+    fields = obj.__getstate__()
+    if isinstance(obj, NumericData):
+        magnitude, uncertainty = _nominal(fields["magnitude"], fields["uncertainty"])
+        return {"version": FORMAT_VERSION, "type": "NumericData", "magnitude": magnitude,
+                "unit": str(fields["units"]), "uncertainty": uncertainty, "symbol": None,
+                "left_side": "", "base_symbols": {}}
+
+    data = fields["data"]
+    if obj.is_symbolic():
+        magnitude, uncertainty = None, fields["uncertainty"]
+    else:
+        magnitude, uncertainty = _split(data, fields["uncertainty"])
+    return {"version": FORMAT_VERSION, "type": "PhysicsData", "magnitude": magnitude,
+            "unit": str(data.units), "uncertainty": uncertainty, "symbol": fields["symbol"],
+            "left_side": fields["left_side"],
+            "base_symbols": {k: (*_split(v), str(v.units))
+                             for k, v in fields["base_symbols"].items()}}
+
+
+def _from_state(state: Dict[str, Any]) -> PhysicsData:
+    _check_version(state)
+    if state["type"] == "NumericData":
+        return NumericData(state["magnitude"], state["unit"], uncertainty=state["uncertainty"])
+
+    registry = get_registry()
+    base_symbols = {k: _plus_minus(registry.Quantity(m, as_units(u)), e)
+                    for k, (m, e, u) in state["base_symbols"].items()}
+    return PhysicsData(state["magnitude"], state["unit"], left_side=state["left_side"],
+                       symbol=state["symbol"], uncertainty=state["uncertainty"],
+                       base_symbols=base_symbols)
+
+
+def _check_version(state: Dict[str, Any]) -> None:
+    version = state.get("version")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported serialization format version: '{version}'")
+
+
+def _split(data: "pint.Quantity", uncertainty: Any = None) -> Tuple[Any, Any]:
+    if isinstance(data, get_registry().Measurement):
+        return data.value.magnitude, data.error.magnitude
+    return _nominal(data.magnitude, uncertainty)
+
+
+def _nominal(magnitude: Any, uncertainty: Any) -> Tuple[Any, Any]:
+    if hasattr(magnitude, "nominal_value"):
+        return magnitude.nominal_value, magnitude.std_dev
+    return magnitude, uncertainty
+
+
+def _encode_array(obj: Any) -> Any:
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    array = numpy.ascontiguousarray(obj)
+    if array.dtype.hasobject:
+        raise TypeError(f"The type of '{obj.__class__.__name__}' can't be serialized")
+    return {"dtype": array.dtype.str, "shape": list(array.shape),
+            "data": base64.b64encode(array.data).decode("ascii")}
+
+
+def _decode_array(obj: Any) -> Optional[Any]:
+    if not isinstance(obj, dict):
+        return obj
+    array = numpy.frombuffer(bytearray(base64.b64decode(obj["data"])), dtype=obj["dtype"])
+    array = array.reshape(obj["shape"])
+    if array.ndim == 0:
+        return array[()]
+    return array
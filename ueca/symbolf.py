@@ -1,12 +1,24 @@
+import functools
 from numbers import Real
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 
-import sympy
+from ueca import profiling
+from ueca.cache import CacheInfo, digest, get_disk_cache, LRUCache
+from ueca.data import as_physicsdata, parse_units, PhysicsData
+from ueca.lazy import lazy_import
 
-from ueca.data import as_physicsdata, PhysicsData, ureg
+
+pint = lazy_import("pint")
+sympy = lazy_import("sympy")
+
+_derivatives = LRUCache(maxsize=1024)
+_cancellations = LRUCache(maxsize=1024)
+_unit_derivatives = LRUCache(maxsize=1024)
+_caches = {"diff": _derivatives, "cancel": _cancellations, "diff_units": _unit_derivatives}
 
 
 def physicsdata_symbolic_exception(func):
+    @functools.wraps(func)
     def wrapper(obj: PhysicsData, *args, **kwargs):
         if not isinstance(obj, PhysicsData):
             raise TypeError(f"The type of '{obj.__class__.__name__}' isn't 'PhysicsData'")
@@ -34,9 +46,56 @@ def dimensionless_exception(obj: PhysicsData) -> None:
                          f"Unit of input: '{obj.unit}'")
 
 
+def diff_expr(expr: "sympy.Basic", symbol: "sympy.Symbol", n: int) -> "sympy.Basic":
+    return _derivatives.get_or_create((expr, symbol, n),
+                                      lambda: _derived("diff", _diff, expr, symbol, n))
+
+
+def cancel_expr(expr: "sympy.Basic") -> "sympy.Basic":
+    return _cancellations.get_or_create(expr, lambda: _derived("cancel", _cancel, expr))
+
+
+def _derived(name: str, function, *args) -> "sympy.Basic":
+    # Derived expressions are shared with other processes through the disk cache, if set
+    disk_cache = get_disk_cache()
+    if disk_cache is None:
+        return function(*args)
+    key = digest(name, sympy.__version__, *[sympy.srepr(arg) for arg in args])
+    return disk_cache.get_or_create(key, lambda: function(*args))
+
+
+@profiling.timed("symbolf.diff")
+def _diff(expr: "sympy.Basic", symbol: "sympy.Symbol", n: int) -> "sympy.Basic":
+    return sympy.diff(expr, symbol, n)
+
+
+@profiling.timed("symbolf.cancel")
+def _cancel(expr: "sympy.Basic") -> "sympy.Basic":
+    return sympy.cancel(expr)
+
+
+def _diff_units(units: "pint.Unit", tgt_units: "pint.Unit", n: int) -> "pint.Unit":
+    return _unit_derivatives.get_or_create((units, tgt_units, n),
+                                           lambda: units / (tgt_units ** n))
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    return {name: cache.info() for name, cache in _caches.items()}
+
+
+def clear_cache() -> None:
+    for cache in _caches.values():
+        cache.clear()
+
+
+def set_cache_limit(maxsize: Optional[int]) -> None:
+    for cache in _caches.values():
+        cache.resize(maxsize)
+
+
 @physicsdata_symbolic_exception
 def cancel(obj: PhysicsData) -> PhysicsData:
-    expr = sympy.cancel(obj.symbol)
+    expr = cancel_expr(obj.symbol)
     return PhysicsData(None, obj.unit, symbol=expr, base_symbols=obj._base_symbols)
 
 
@@ -49,18 +108,19 @@ def diff(obj: PhysicsData, symbol: str, n: int) -> PhysicsData:
             raise ValueError(f"unsupport differentiation by non symbol: '{symbol}'")
     elif isinstance(symbol, str):
         if symbol in obj._base_symbols:
-            tgt_unit = str(obj._base_symbols[symbol].uints)
+            tgt_unit = str(obj._base_symbols[symbol].units)
         elif obj.data.dimensionless:
             tgt_unit = "dimensionless"
         else:
             raise ValueError(f"'PhysicsData' don't include the symbol: '{symbol}'")
-        tgt_units = ureg.parse_units(tgt_unit)
+        tgt_units = parse_units(tgt_unit)
+        symbol = sympy.Symbol(symbol)
 
     else:
         raise TypeError(f"unsupport differentiation by type of '{symbol.__class__.__name__}'")
 
-    new_symbol = sympy.diff(obj.symbol, symbol, n)
-    new_unit = str(obj.data.units / (tgt_units ** n))
+    new_symbol = diff_expr(obj.symbol, symbol, n)
+    new_unit = _diff_units(obj.data.units, tgt_units, n)
     _free_symbol_keys = [str(i) for i in new_symbol.free_symbols]
     new_symbols = {k: v for k, v in obj._base_symbols.items() if k in _free_symbol_keys}
     return PhysicsData(None, new_unit, symbol=new_symbol, base_symbols=new_symbols)
@@ -0,0 +1,211 @@
+import os
+from typing import Any, IO, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy
+
+from ueca.data import NumericData, PhysicsData, _conversion, _convert, as_units, get_registry
+from ueca.io import read_csv
+from ueca.lazy import lazy_import
+
+
+pint = lazy_import("pint")
+sympy = lazy_import("sympy")
+
+
+class PhysicsTable:
+    """Columns of equal length, each one NumPy array with a unit and an optional uncertainty
+
+    Cells are never wrapped one by one. ``symbol`` gives a symbolic PhysicsData
+    standing for a whole column, so derived columns are written with the usual
+    operators and ``ueca.symbolf`` functions, then assigned to the table and
+    evaluated over every row with one compiled call.
+    """
+
+    __slots__ = ("_values", "_units", "_errors", "_length")
+
+    def __init__(self, columns: Optional[Mapping[str, Any]] = None,
+                 units: Optional[Mapping[str, str]] = None,
+                 uncertainties: Optional[Mapping[str, Any]] = None) -> None:
+        self._values = {}
+        self._units = {}
+        self._errors = {}
+        self._length = None
+
+        units = units or {}
+        uncertainties = uncertainties or {}
+        for name in list(units) + list(uncertainties):
+            if name not in (columns or {}):
+                raise ValueError(f"'PhysicsTable' don't include the column: '{name}'")
+
+        for name, column in (columns or {}).items():
+            if not isinstance(column, PhysicsData):
+                column = NumericData(numpy.asarray(column), units.get(name, "dimensionless"),
+                                     uncertainty=uncertainties.get(name))
+            elif name in units or name in uncertainties:
+                raise ValueError(f"The unit and uncertainty of '{name}' are given by PhysicsData")
+            self[name] = column
+
+    @classmethod
+    def from_csv(cls, file: Union[str, "os.PathLike", IO[str]], **kwargs: Any) -> "PhysicsTable":
+        """Read a table with ``ueca.io.read_csv``, which takes the keyword arguments"""
+        return cls(read_csv(file, **kwargs))
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(self._values)
+
+    def symbol(self, name: str) -> PhysicsData:
+        """Symbolic PhysicsData standing for the column ``name`` in expressions"""
+        if name not in self._values:
+            raise ValueError(f"'PhysicsTable' don't include the column: '{name}'")
+        values = self._values[name]
+        value = values[0] if len(values) else numpy.nan
+        return PhysicsData(value, self._units[name], symbol=name)
+
+    def symbols(self, *names: str) -> Tuple[PhysicsData, ...]:
+        return tuple(self.symbol(name) for name in names or self.columns)
+
+    def evaluate(self, expr: PhysicsData) -> NumericData:
+        """Evaluate ``expr`` over every row, propagating the column uncertainties"""
+        if not isinstance(expr, PhysicsData):
+            raise TypeError(f"The type of '{expr.__class__.__name__}' isn't 'PhysicsData'")
+
+        if not expr.is_symbolic():
+            return self.__broadcast(expr)
+
+        values = {}
+        uncertainties = {}
+        for name, data in expr._base_symbols.items():
+            if name not in self._values:
+                continue
+            values[name] = self.__magnitude(self._values[name], name, data.units)
+            if self._errors[name] is not None:
+                uncertainties[name] = self.__magnitude(self._errors[name], name, data.units,
+                                                       difference=True)
+
+        result = expr.evaluate_batch(values, uncertainties)
+        return self.__broadcast(result)
+
+    def __magnitude(self, magnitude: Any, name: str, units: "pint.Unit",
+                    difference: bool = False) -> Any:
+        if self._units[name] == units:
+            return magnitude
+        conversion = _conversion(self._units[name], units)
+        if conversion is None:
+            return get_registry().Quantity(magnitude, self._units[name]).to(units).magnitude
+        if difference:
+            # Uncertainties are differences, so the offset of units like degC doesn't apply
+            return magnitude * conversion[0]
+        return _convert(magnitude, conversion)
+
+    def __broadcast(self, data: PhysicsData) -> NumericData:
+        value = data.value
+        if isinstance(data.data, get_registry().Measurement):
+            value = data.data.value.magnitude
+        error = data.uncertainty
+        if self._length is not None:
+            value = numpy.broadcast_to(value, (self._length,))
+            if error is not None:
+                error = numpy.broadcast_to(error, (self._length,))
+        return NumericData(numpy.asarray(value), data.unit,
+                           uncertainty=None if error is None else numpy.asarray(error))
+
+    def to_latex(self, columns: Optional[Sequence[str]] = None, symbolic_unit: bool = True,
+                 float_format: str = "{:g}") -> str:
+        """LaTeX tabular with one header cell ``name / unit`` per column"""
+        from ueca import latex
+
+        columns = self.columns if columns is None else columns
+        for name in columns:
+            if name not in self._values:
+                raise ValueError(f"'PhysicsTable' don't include the column: '{name}'")
+
+        latex_spec = "{:~L}" if symbolic_unit else "{:L}"
+        header = []
+        for name in columns:
+            cell = f"${latex.latex(sympy.Symbol(name))}$"
+            if self._units[name] != as_units("dimensionless"):
+                cell += f" / ${latex_spec.format(self._units[name])}$"
+            header.append(cell)
+
+        lines = [f"\\begin{{tabular}}{{{'c' * len(columns)}}}", "\\hline",
+                 " & ".join(header) + " \\\\", "\\hline"]
+        for i in range(len(self)):
+            cells = []
+            for name in columns:
+                value = self._values[name][i]
+                error = self._errors[name]
+                if error is not None and error[i]:
+                    measurement = get_registry().Measurement(value, error[i], "dimensionless")
+                    cells.append(f"${measurement.magnitude:L}$")
+                else:
+                    cells.append(f"${float_format.format(value)}$")
+            lines.append(" & ".join(cells) + " \\\\")
+        lines += ["\\hline", "\\end{tabular}"]
+        return "\n".join(lines)
+
+    def __getitem__(self, name: str) -> NumericData:
+        if name not in self._values:
+            raise KeyError(name)
+        return NumericData(self._values[name], self._units[name],
+                           uncertainty=self._errors[name])
+
+    def __setitem__(self, name: str, data: PhysicsData) -> None:
+        if not isinstance(data, PhysicsData):
+            raise TypeError(f"The type of '{data.__class__.__name__}' isn't 'PhysicsData'")
+
+        if data.is_symbolic():
+            data = self.evaluate(data)
+        values, units, errors = _column_arrays(data)
+
+        if numpy.ndim(values) == 0:
+            if self._length is None:
+                raise ValueError(f"The length of the column '{name}' is unknown")
+            values = numpy.full(self._length, values)
+        if errors is not None and numpy.ndim(errors) == 0:
+            errors = numpy.full(len(values), errors)
+
+        others = [k for k in self._values if k != name]
+        if others and len(values) != self._length:
+            raise ValueError(f"The length of the column '{name}' isn't {self._length}: "
+                             f"'{len(values)}'")
+
+        self._values[name] = values
+        self._units[name] = units
+        self._errors[name] = errors
+        self._length = len(values)
+
+    def __delitem__(self, name: str) -> None:
+        del self._values[name]
+        del self._units[name]
+        del self._errors[name]
+        if not self._values:
+            self._length = None
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return self._length or 0
+
+    def __repr__(self) -> str:
+        columns = ", ".join(f"{k} [{self._units[k]}]" for k in self._values)
+        return f"{self.__class__.__name__}({len(self)} rows: {columns})"
+
+
+def _column_arrays(data: PhysicsData) -> Tuple[Any, "pint.Unit", Optional[Any]]:
+    if isinstance(data, NumericData):
+        magnitude, units, errors = data._magnitude, data._units, data._error
+    else:
+        magnitude, units, errors = data.data.magnitude, data.data.units, data.uncertainty
+
+    if isinstance(data.data, get_registry().Measurement):
+        magnitude = data.data.value.magnitude
+        errors = data.data.error.magnitude
+    values = numpy.asarray(magnitude, dtype=float)
+    if errors is not None:
+        errors = numpy.asarray(errors, dtype=float)
+    return values, units, errors
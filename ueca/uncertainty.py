@@ -1,29 +1,585 @@
-import sympy
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
 
-from ueca.data import PhysicsData, ureg
-from ueca.symbolf import cancel, diff, sqrt
+import numpy
 
+from ueca import profiling
+from ueca.compiler import compile_expr
+from ueca.data import as_units, get_registry, PhysicsData
+from ueca.lazy import lazy_import
+from ueca.symbolf import (cancel, cancel_expr, diff, diff_expr, physicsdata_symbolic_exception,
+                          sqrt)
 
+
+pint = lazy_import("pint")
+sympy = lazy_import("sympy")
+
+
+@profiling.timed("uncertainty.combined_standard_uncertainty")
 def combined_standard_uncertainty(obj: PhysicsData, prefix: str = "Delta",
-                                  relative: bool = False, use_cancel: bool = True) -> PhysicsData:
+                                  relative: bool = False, use_cancel: bool = True,
+                                  parallel: bool = False, executor: Optional[Executor] = None,
+                                  max_workers: Optional[int] = None) -> PhysicsData:
+    """Combined standard uncertainty of independent Measurement inputs
+
+    The term of each input is independent of the others. With ``parallel=True``
+    they are derived on a process pool of ``max_workers`` processes (by default
+    one per term, up to the CPU count), or on ``executor`` when it is given.
+    The result is identical to the serial one.
+    """
     if relative:
-        sum_of_squares = PhysicsData(None, unit="dimensionless", symbol=sympy.S.Zero)
+        unit = "dimensionless"
     else:
-        sum_of_squares = PhysicsData(None, unit=str(obj.data.units ** 2), symbol=sympy.S.Zero)
+        unit = obj.data.units ** 2
 
+    base_symbols = dict(obj._base_symbols)
+    tasks = []
     for symbol_name, data in obj._base_symbols.items():
-        if isinstance(data, ureg.Measurement):
-            unit = str(data.units)
-            symbol = PhysicsData(data.magnitude, unit, symbol=symbol_name)
-            delta = PhysicsData(data.error.magnitude, unit, symbol=f"{prefix} {symbol_name}")
-            square_root = diff(obj, symbol, 1) * delta
-            if relative:
-                square_root = square_root / obj
+        if isinstance(data, get_registry().Measurement):
+            delta_name = f"{prefix} {symbol_name}"
+            base_symbols[delta_name] = get_registry().Quantity(data.error.magnitude, data.units)
+            tasks.append((obj.symbol, sympy.Symbol(symbol_name), sympy.Symbol(delta_name),
+                          relative, use_cancel))
 
-            if use_cancel:
-                square_root = cancel(square_root)
-
-            sum_of_squares += square_root ** 2
+    squares = _map(_square_of_uncertainty_term, tasks, parallel, executor, max_workers)
 
+    # executor.map keeps the order of the inputs and Add sorts its terms canonically
+    sum_of_squares = PhysicsData(None, unit, symbol=sympy.Add(*squares),
+                                 base_symbols=base_symbols)
     output = sqrt(sum_of_squares, apply_dim=True)
     return output
+
+
+def default_max_workers(n_tasks: int) -> int:
+    return max(1, min(n_tasks, os.cpu_count() or 1))
+
+
+def _map(function: Callable, tasks: Sequence[tuple], parallel: bool = False,
+         executor: Optional[Executor] = None, max_workers: Optional[int] = None) -> List[Any]:
+    """``function(*task)`` of each task in order, on ``executor`` or a process pool if asked"""
+    if executor is None and parallel and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers or default_max_workers(len(tasks))) \
+                as pool:
+            return list(pool.map(function, *zip(*tasks)))
+    if executor is not None and tasks:
+        return list(executor.map(function, *zip(*tasks)))
+    return [function(*task) for task in tasks]
+
+
+def _square_of_uncertainty_term(expr: "sympy.Basic", symbol: "sympy.Symbol",
+                                delta: "sympy.Symbol", relative: bool,
+                                use_cancel: bool) -> "sympy.Basic":
+    square_root = diff_expr(expr, symbol, 1) * delta
+    if relative:
+        square_root = square_root / expr
+
+    if use_cancel:
+        square_root = cancel_expr(square_root)
+
+    return square_root ** 2
+
+
+class UncertaintyPropagation:
+    """First-order propagation of ``obj`` derived once and evaluated over many datasets
+
+    The sensitivity coefficients of ``symbols`` (by default every base symbol
+    holding a Measurement) are differentiated once. ``evaluate`` then computes
+    the value and the combined standard uncertainty over arrays of input values
+    and input uncertainties with a single call to the compiled functions.
+    """
+
+    @profiling.timed("uncertainty.propagation_derivation")
+    def __init__(self, obj: PhysicsData, symbols: Optional[Sequence[str]] = None,
+                 use_cancel: bool = True) -> None:
+        base_symbols = _symbolic(obj)._base_symbols
+        symbols = _propagated_symbols(base_symbols, symbols)
+
+        self.obj = obj
+        self.names = tuple(sorted(base_symbols))
+        self.symbols = tuple(k for k in self.names if k in symbols)
+
+        sensitivities = []
+        for name in self.symbols:
+            data = base_symbols[name]
+            symbol = PhysicsData(data.magnitude, data.units, symbol=name)
+            coefficient = diff(obj, symbol, 1)
+            if use_cancel:
+                coefficient = cancel(coefficient)
+            sensitivities.append(coefficient)
+        self.sensitivities = tuple(sensitivities)
+
+        # Value and uncertainty share most subterms, so they are compiled into one function
+        errors = [sympy.Symbol(f"u({k})") for k in self.symbols]
+        self.uncertainty_expr = sympy.sqrt(sympy.Add(*[(c.symbol * u) ** 2 for c, u
+                                                       in zip(sensitivities, errors)]))
+        args = [sympy.Symbol(k) for k in self.names] + errors
+        self._function = compile_expr(args, [obj.symbol, self.uncertainty_expr])
+        self._budget_function = None
+
+    def arguments(self, values: Optional[Mapping[str, Any]] = None) -> List[Any]:
+        return _arguments(self.names, self.obj._base_symbols, values)
+
+    def input_uncertainties(self, uncertainties: Optional[Mapping[str, Any]] = None) -> List[Any]:
+        return _input_uncertainties(self.symbols, self.obj._base_symbols, uncertainties,
+                                    self.__class__.__name__)
+
+    @profiling.timed("uncertainty.propagation_evaluation")
+    def evaluate(self, values: Optional[Mapping[str, Any]] = None,
+                 uncertainties: Optional[Mapping[str, Any]] = None,
+                 relative: bool = False) -> Tuple[PhysicsData, PhysicsData]:
+        arrays = self.arguments(values)
+        errors = self.input_uncertainties(uncertainties)
+
+        value, uncertainty = self._function(*arrays, *errors)
+        if numpy.ndim(value) != numpy.ndim(uncertainty):
+            value, uncertainty = numpy.broadcast_arrays(value, uncertainty)
+
+        if relative:
+            return (PhysicsData(value, self.obj.unit),
+                    PhysicsData(uncertainty / numpy.abs(value), "dimensionless"))
+        return PhysicsData(value, self.obj.unit), PhysicsData(uncertainty, self.obj.unit)
+
+    @profiling.timed("uncertainty.budget_evaluation")
+    def budget(self, values: Optional[Mapping[str, Any]] = None,
+               uncertainties: Optional[Mapping[str, Any]] = None) -> "UncertaintyBudget":
+        """Uncertainty budget of ``obj`` from the sensitivity coefficients already derived
+
+        The value and every coefficient are computed by one call to a compiled
+        function, so arrays of input values give a budget per data point.
+        """
+        if self._budget_function is None:
+            args = [sympy.Symbol(k) for k in self.names]
+            self._budget_function = compile_expr(
+                args, [self.obj.symbol] + [c.symbol for c in self.sensitivities])
+
+        arrays = self.arguments(values)
+        errors = self.input_uncertainties(uncertainties)
+        value, *coefficients = self._budget_function(*arrays)
+        inputs = [arrays[self.names.index(k)] for k in self.symbols]
+
+        shape = _broadcast_shape([value, *coefficients, *errors, *inputs])
+        sensitivities = _stack(coefficients, shape)
+        errors = _stack(errors, shape)
+        contributions = numpy.abs(sensitivities * errors)
+        squares = contributions ** 2
+        variance = squares.sum(axis=0)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            percentages = 100 * squares / variance
+
+        return UncertaintyBudget(self.symbols,
+                                 tuple(str(self.obj._base_symbols[k].units)
+                                       for k in self.symbols),
+                                 tuple(c.unit for c in self.sensitivities),
+                                 self.obj.unit,
+                                 numpy.broadcast_to(value, shape).astype(float),
+                                 numpy.sqrt(variance), _stack(inputs, shape), errors,
+                                 sensitivities, contributions, percentages)
+
+
+class UncertaintyBudget(NamedTuple):
+    """Per input terms of the combined standard uncertainty
+
+    The arrays are indexed by input first, in the order of ``names``, then by
+    data point. ``contributions`` are ``|c_i| u(x_i)`` in the unit of the
+    output and ``percentages`` are their shares of the variance.
+    """
+    names: Tuple[str, ...]
+    units: Tuple[str, ...]
+    sensitivity_units: Tuple[str, ...]
+    unit: str
+    value: Any
+    uncertainty: Any
+    input_values: Any
+    input_uncertainties: Any
+    sensitivities: Any
+    contributions: Any
+    percentages: Any
+
+    def to_latex(self, index: Union[None, int, Tuple[int, ...]] = None,
+                 symbolic_unit: bool = True, float_format: str = "{:.3g}") -> str:
+        """LaTeX tabular of the budget, of the data point ``index`` for a batch"""
+        from ueca import latex
+
+        if index is None:
+            if numpy.ndim(self.value) != 0:
+                raise ValueError("'index' is required for the budget of many data points")
+            index = ()
+        elif isinstance(index, int):
+            index = (index,)
+
+        latex_spec = "{:~L}" if symbolic_unit else "{:L}"
+
+        def cell(value: Any, unit: str) -> str:
+            text = float_format.format(float(value))
+            units = as_units(unit)
+            if units != as_units("dimensionless"):
+                text += f"\\ {latex_spec.format(units)}"
+            return f"${text}$"
+
+        lines = ["\\begin{tabular}{cccccc}", "\\hline",
+                 "Quantity & Value & Standard uncertainty & Sensitivity coefficient & "
+                 "Contribution & Share / \\% \\\\", "\\hline"]
+        for i, name in enumerate(self.names):
+            point = (i,) + index
+            cells = [f"${latex.latex(sympy.Symbol(name))}$",
+                     cell(self.input_values[point], self.units[i]),
+                     cell(self.input_uncertainties[point], self.units[i]),
+                     cell(self.sensitivities[point], self.sensitivity_units[i]),
+                     cell(self.contributions[point], self.unit),
+                     f"${float_format.format(float(self.percentages[point]))}$"]
+            lines.append(" & ".join(cells) + " \\\\")
+        lines += ["\\hline",
+                  f"Combined & {cell(self.value[index], self.unit)} & "
+                  f"{cell(self.uncertainty[index], self.unit)} & & & $100$ \\\\",
+                  "\\hline", "\\end{tabular}"]
+        return "\n".join(lines)
+
+
+def uncertainty_budget(obj: PhysicsData, values: Optional[Mapping[str, Any]] = None,
+                       uncertainties: Optional[Mapping[str, Any]] = None,
+                       symbols: Optional[Sequence[str]] = None,
+                       use_cancel: bool = True) -> UncertaintyBudget:
+    return UncertaintyPropagation(obj, symbols=symbols, use_cancel=use_cancel).budget(
+        values, uncertainties)
+
+
+class CovariancePropagation:
+    """First-order propagation ``J Σ J^T`` of correlated inputs to one or many outputs
+
+    The Jacobian of ``outputs`` with respect to ``symbols`` (by default every
+    base symbol holding a Measurement) is derived once and compiled together
+    with the outputs into one function. ``evaluate`` then propagates one
+    covariance matrix, or one per data point, with batched matrix products.
+    """
+
+    @profiling.timed("uncertainty.covariance_derivation")
+    def __init__(self, outputs: Union[PhysicsData, Sequence[PhysicsData]],
+                 symbols: Optional[Sequence[str]] = None, use_cancel: bool = True) -> None:
+        if isinstance(outputs, PhysicsData):
+            outputs = [outputs]
+        if len(outputs) == 0:
+            raise ValueError("'outputs' is empty")
+
+        base_symbols = _merged_base_symbols(outputs)
+        symbols = _propagated_symbols(base_symbols, symbols)
+
+        self.outputs = tuple(outputs)
+        self.units = tuple(obj.unit for obj in self.outputs)
+        self.names = tuple(sorted(base_symbols))
+        self.symbols = tuple(k for k in self.names if k in symbols)
+        self._base_symbols = base_symbols
+
+        entries = []
+        for obj in self.outputs:
+            for name in self.symbols:
+                entry = diff_expr(obj.symbol, sympy.Symbol(name), 1)
+                if use_cancel:
+                    entry = cancel_expr(entry)
+                entries.append(entry)
+        self.jacobian_expr = sympy.ImmutableMatrix(len(self.outputs), len(self.symbols), entries)
+
+        args = [sympy.Symbol(k) for k in self.names]
+        self._function = compile_expr(args, [obj.symbol for obj in self.outputs] + entries)
+
+    def arguments(self, values: Optional[Mapping[str, Any]] = None) -> List[Any]:
+        return _arguments(self.names, self._base_symbols, values)
+
+    def covariance_matrix(self, uncertainties: Optional[Mapping[str, Any]] = None,
+                          correlations: Optional[Mapping[Tuple[str, str], float]] = None
+                          ) -> "numpy.ndarray":
+        """Input covariance matrix in the order of ``symbols``
+
+        The standard uncertainties default to the ones of the Measurements and
+        ``correlations`` maps pairs of symbols to their correlation coefficients.
+        """
+        errors = _input_uncertainties(self.symbols, self._base_symbols, uncertainties,
+                                      self.__class__.__name__)
+        correlation = numpy.eye(len(self.symbols))
+        for pair, coefficient in (correlations or {}).items():
+            for name in pair:
+                if name not in self.symbols:
+                    raise ValueError(f"'{name}' isn't propagated by this "
+                                     f"'{self.__class__.__name__}'")
+            if not -1 <= coefficient <= 1:
+                raise ValueError(f"The correlation must be between -1 and 1: '{coefficient}'")
+            i, j = (self.symbols.index(name) for name in pair)
+            if i == j:
+                raise ValueError(f"The correlation of '{pair[0]}' with itself is always 1")
+            correlation[i, j] = correlation[j, i] = coefficient
+
+        shape = _broadcast_shape(errors)
+        errors = numpy.moveaxis(_stack(errors, shape), 0, -1)
+        return errors[..., :, None] * correlation * errors[..., None, :]
+
+    def jacobian(self, values: Optional[Mapping[str, Any]] = None) -> "numpy.ndarray":
+        """Jacobian of shape ``(..., len(outputs), len(symbols))``"""
+        results = self._function(*self.arguments(values))
+        shape = _broadcast_shape(results)
+        return self.__jacobian(results, shape)
+
+    @profiling.timed("uncertainty.covariance_evaluation")
+    def evaluate(self, values: Optional[Mapping[str, Any]] = None,
+                 covariance: Optional[Any] = None) -> "CovarianceResult":
+        """Propagate ``covariance``, a matrix or an array of shape ``(..., n, n)``
+
+        It is in the units of ``symbols`` and defaults to ``covariance_matrix()``.
+        """
+        if covariance is None:
+            covariance = self.covariance_matrix()
+        covariance = numpy.asarray(covariance, dtype=float)
+        n = len(self.symbols)
+        if covariance.shape[-2:] != (n, n):
+            raise ValueError(f"The shape of the covariance isn't (..., {n}, {n}): "
+                             f"'{covariance.shape}'")
+
+        results = self._function(*self.arguments(values))
+        shape = _broadcast_shape([*results, covariance[..., 0, 0]])
+        jacobian = self.__jacobian(results, shape)
+        # einsum picks the contraction order, about twice as fast as batched matmul here
+        subscripts = "...ij,jk,...lk->...il" if covariance.ndim == 2 else "...ij,...jk,...lk->...il"
+        output_covariance = numpy.einsum(subscripts, jacobian, covariance, jacobian,
+                                         optimize=True)
+
+        values = tuple(PhysicsData(numpy.broadcast_to(value, shape), unit)
+                       for value, unit in zip(results, self.units))
+        return CovarianceResult(values, output_covariance, self.units)
+
+    def __jacobian(self, results: Sequence[Any], shape: Tuple[int, ...]) -> "numpy.ndarray":
+        m, n = len(self.outputs), len(self.symbols)
+        # Filling the last axis directly avoids a transposed copy of the stacked entries
+        jacobian = numpy.empty(shape + (m * n,))
+        for i, entry in enumerate(results[m:]):
+            jacobian[..., i] = entry
+        return jacobian.reshape(shape + (m, n))
+
+
+class CovarianceResult(NamedTuple):
+    values: Tuple[PhysicsData, ...]
+    covariance: Any
+    units: Tuple[str, ...]
+
+    def uncertainties(self) -> Tuple[PhysicsData, ...]:
+        variances = numpy.diagonal(self.covariance, axis1=-2, axis2=-1)
+        return tuple(PhysicsData(numpy.sqrt(variances[..., i]), unit)
+                     for i, unit in enumerate(self.units))
+
+    def correlation(self) -> "numpy.ndarray":
+        errors = numpy.sqrt(numpy.diagonal(self.covariance, axis1=-2, axis2=-1))
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return self.covariance / (errors[..., :, None] * errors[..., None, :])
+
+
+def _merged_base_symbols(outputs: Sequence[PhysicsData]) -> Dict[str, Any]:
+    base_symbols = {}
+    for obj in outputs:
+        base_symbols.update(_symbolic(obj)._base_symbols)
+    return base_symbols
+
+
+@physicsdata_symbolic_exception
+def _symbolic(obj: PhysicsData) -> PhysicsData:
+    return obj
+
+
+def _propagated_symbols(base_symbols: Mapping[str, Any],
+                        symbols: Optional[Sequence[str]]) -> Sequence[str]:
+    # By default every base symbol holding a Measurement is propagated
+    if symbols is None:
+        return [k for k, v in base_symbols.items() if isinstance(v, get_registry().Measurement)]
+    for name in symbols:
+        if name not in base_symbols:
+            raise ValueError(f"'PhysicsData' don't include the symbol: '{name}'")
+    return symbols
+
+
+def _broadcast_shape(arrays: Sequence[Any]) -> Tuple[int, ...]:
+    # numpy.broadcast_shapes needs numpy 1.20, and old numpy.broadcast takes at most 32 arrays
+    shape = ()
+    for i in range(0, len(arrays), 31):
+        shape = numpy.broadcast(numpy.broadcast_to(0.0, shape), *arrays[i:i + 31]).shape
+    return shape
+
+
+def _stack(arrays: Sequence[Any], shape: Tuple[int, ...]) -> "numpy.ndarray":
+    stacked = [numpy.broadcast_to(array, shape) for array in arrays]
+    return numpy.array(stacked, dtype=float).reshape((len(stacked),) + shape)
+
+
+def _arguments(names: Sequence[str], base_symbols: Mapping[str, Any],
+               values: Optional[Mapping[str, Any]]) -> List[Any]:
+    values = values or {}
+    for name in values:
+        if name not in names:
+            raise ValueError(f"'PhysicsData' don't include the symbol: '{name}'")
+
+    arrays = []
+    for k in names:
+        data = base_symbols[k]
+        if k in values:
+            arrays.append(_batch_magnitude(values[k], data.units))
+        elif isinstance(data, get_registry().Measurement):
+            arrays.append(data.value.magnitude)
+        else:
+            arrays.append(data.magnitude)
+    return arrays
+
+
+def _input_uncertainties(symbols: Sequence[str], base_symbols: Mapping[str, Any],
+                         uncertainties: Optional[Mapping[str, Any]], owner: str) -> List[Any]:
+    uncertainties = uncertainties or {}
+    for name in uncertainties:
+        if name not in symbols:
+            raise ValueError(f"'{name}' isn't propagated by this '{owner}'")
+
+    errors = []
+    for k in symbols:
+        data = base_symbols[k]
+        if k in uncertainties:
+            errors.append(_batch_magnitude(uncertainties[k], data.units))
+        elif isinstance(data, get_registry().Measurement):
+            errors.append(data.error.magnitude)
+        else:
+            errors.append(0)
+    return errors
+
+
+def _batch_magnitude(obj: Any, units: "pint.Unit") -> Any:
+    if isinstance(obj, PhysicsData):
+        obj = obj.data
+    if isinstance(obj, get_registry().Quantity):
+        return obj.to(units).magnitude
+    return numpy.asarray(obj)
+
+
+class MonteCarloResult(NamedTuple):
+    mean: float
+    standard_deviation: float
+    coverage_interval: Tuple[float, float]
+    coverage: float
+    n_samples: int
+    unit: str
+
+    def to_physicsdata(self) -> PhysicsData:
+        return PhysicsData(self.mean, self.unit, uncertainty=self.standard_deviation)
+
+
+@profiling.timed("uncertainty.monte_carlo")
+@physicsdata_symbolic_exception
+def monte_carlo_uncertainty(obj: PhysicsData, n_samples: int = 10 ** 6,
+                            rng: Union[None, int, "numpy.random.Generator"] = None,
+                            chunk_size: Optional[int] = None,
+                            coverage: float = 0.95) -> MonteCarloResult:
+    """Propagate uncertainty by Monte Carlo sampling in the spirit of GUM Supplement 1
+
+    Every base symbol holding a Measurement is drawn from a normal distribution
+    with its standard uncertainty, and the compiled expression is evaluated on
+    whole sample arrays. With ``chunk_size`` the samples are drawn in chunks, so
+    memory stays bounded: mean and standard deviation are combined exactly, and
+    the probabilistically symmetric coverage interval is read from a histogram
+    of all the samples, accurate to about 1e-4 of their range.
+    """
+    if n_samples < 2:
+        raise ValueError(f"n_samples must be at least 2: '{n_samples}'")
+
+    if not 0 < coverage < 1:
+        raise ValueError(f"coverage must be between 0 and 1: '{coverage}'")
+
+    rng = numpy.random.default_rng(rng)
+    chunk_size = n_samples if chunk_size is None else min(chunk_size, n_samples)
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive: '{chunk_size}'")
+
+    names = sorted(obj._base_symbols)
+    function = compile_expr([sympy.Symbol(k) for k in names], obj.symbol)
+    probabilities = [(1 - coverage) / 2, (1 + coverage) / 2]
+
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    histogram = _Histogram() if chunk_size < n_samples else None
+    while count < n_samples:
+        size = min(chunk_size, n_samples - count)
+        samples = _samples(function, [obj._base_symbols[k] for k in names], rng, size)
+
+        # Chan et al. pairwise update of the running mean and sum of squared deviations
+        chunk_mean = samples.mean()
+        chunk_m2 = ((samples - chunk_mean) ** 2).sum()
+        total = count + size
+        delta = chunk_mean - mean
+        mean += delta * size / total
+        m2 += chunk_m2 + delta ** 2 * count * size / total
+        if histogram is None:
+            endpoints = numpy.quantile(samples, probabilities)
+        else:
+            histogram.update(samples)
+        count = total
+
+    if histogram is not None:
+        endpoints = histogram.quantiles(probabilities)
+    return MonteCarloResult(float(mean), float(numpy.sqrt(m2 / (count - 1))),
+                            (float(endpoints[0]), float(endpoints[1])),
+                            coverage, count, obj.unit)
+
+
+def _samples(function: Callable, inputs: Sequence[Any], rng: "numpy.random.Generator",
+             size: int) -> "numpy.ndarray":
+    arrays = []
+    for data in inputs:
+        if isinstance(data, get_registry().Measurement):
+            arrays.append(rng.normal(data.value.magnitude, data.error.magnitude, size))
+        else:
+            arrays.append(data.magnitude)
+    return numpy.broadcast_to(function(*arrays), (size,)).astype(float)
+
+
+class _Histogram:
+    """Counts of samples in equal bins, doubling the range whenever a sample falls outside
+
+    Doubling merges pairs of bins, so no sample is ever counted twice or lost,
+    and the bin width stays within twice what the final range needs.
+    """
+
+    bins = 2 ** 14
+
+    def __init__(self) -> None:
+        self.counts = numpy.zeros(self.bins, dtype=numpy.int64)
+        self.start = None
+        self.width = 0.0
+
+    def update(self, samples: "numpy.ndarray") -> None:
+        low, high = float(samples.min()), float(samples.max())
+        if not numpy.isfinite(low) or not numpy.isfinite(high):
+            raise ValueError("The coverage interval of chunks needs finite samples")
+        if self.start is None:
+            self.start = low
+            self.width = max(high - low, abs(low) * 1e-12, 1e-300) / (self.bins - 1)
+        while low < self.start:
+            self.__double(left=True)
+        while high >= self.start + self.bins * self.width:
+            self.__double(left=False)
+        indices = ((samples - self.start) / self.width).astype(numpy.int64)
+        numpy.clip(indices, 0, self.bins - 1, out=indices)
+        if len(indices) < self.bins // 16:
+            numpy.add.at(self.counts, indices, 1)
+        else:
+            self.counts += numpy.bincount(indices, minlength=self.bins)
+
+    def __double(self, left: bool) -> None:
+        merged = self.counts.reshape(-1, 2).sum(axis=1)
+        self.counts[:] = 0
+        if left:
+            self.counts[self.bins // 2:] = merged
+            self.start -= self.bins * self.width
+        else:
+            self.counts[:self.bins // 2] = merged
+        self.width *= 2
+
+    def quantiles(self, probabilities: Sequence[float]) -> "numpy.ndarray":
+        # Linear interpolation inside the bin where the cumulative count crosses each level
+        cumulative = numpy.cumsum(self.counts)
+        levels = numpy.asarray(probabilities) * cumulative[-1]
+        indices = numpy.searchsorted(cumulative, levels, side="left")
+        before = numpy.where(indices > 0, cumulative[indices - 1], 0)
+        fractions = (levels - before) / self.counts[indices]
+        return self.start + (indices + fractions) * self.width
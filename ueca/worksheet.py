@@ -0,0 +1,226 @@
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import numpy
+
+from ueca import latex, profiling
+from ueca.data import _conversion, as_units, NumericData, PhysicsData, get_registry
+from ueca.lazy import lazy_import
+from ueca.formula import parse_formula
+from ueca.uncertainty import UncertaintyPropagation
+
+
+pint = lazy_import("pint")
+sympy = lazy_import("sympy")
+
+
+class Worksheet:
+    """Inputs and the quantities derived from them, recomputed only where an input changed
+
+    Each quantity records the inputs its expression depends on. Setting an
+    input marks only its dependents dirty, and they are re-evaluated on the
+    next access with the functions compiled when they were first evaluated.
+    The LaTeX of an expression doesn't depend on the values, so only the
+    LaTeX printed with ``force_value`` is redone.
+
+    A quantity defined from another one captures the expression the other
+    had at that time; redefining the other doesn't change it.
+    """
+
+    def __init__(self) -> None:
+        self._inputs = {}
+        self._nodes = {}
+        self._dependents = {}
+
+    def set_input(self, name: str, value: Any, unit: Optional[str] = None,
+                  uncertainty: Optional[Any] = None) -> None:
+        """Set or correct the input ``name``
+
+        The unit and the uncertainty left out are kept from the previous value,
+        the uncertainty converted to the new unit.
+        """
+        if name in self._nodes:
+            raise ValueError(f"'{name}' is a derived quantity")
+
+        previous = self._inputs.get(name)
+        if previous is not None:
+            if unit is None:
+                unit = previous.unit
+            elif as_units(unit).dimensionality != previous.data.units.dimensionality:
+                # The dependents were checked against the previous dimension
+                raise ValueError(f"The dimension of '{name}' can't change: "
+                                 f"'{previous.unit}' to '{unit}'")
+            if uncertainty is None and previous.uncertainty is not None:
+                uncertainty = _difference(previous.uncertainty, previous.data.units,
+                                          as_units(unit))
+        self._inputs[name] = PhysicsData(value, unit or "dimensionless", symbol=name,
+                                         uncertainty=uncertainty)
+
+        for dependent in self._dependents.get(name, ()):
+            self._nodes[dependent].invalidate()
+
+    def define(self, name: str, data: Union[PhysicsData, str]) -> None:
+        """Define the quantity ``name`` from an expression of the worksheet's entries
+
+        ``data`` is built from ``worksheet[...]`` with the usual operators, or is
+        a formula like ``"4*pi**2*L/T**2"``.
+        """
+        if name in self._inputs:
+            raise ValueError(f"'{name}' is an input")
+        if isinstance(data, str):
+            data = parse_formula(data, {k: self[k] for k in self})
+        if not isinstance(data, PhysicsData):
+            raise TypeError(f"The type of '{data.__class__.__name__}' isn't 'PhysicsData'")
+        if not data.is_symbolic():
+            raise ValueError("'PhysicsData' isn't the symbolic mode")
+
+        if name in self._nodes:
+            self.remove(name)
+        dependencies = tuple(sorted(k for k in data._base_symbols if k in self._inputs))
+        self._nodes[name] = _Node(data, dependencies)
+        for k in dependencies:
+            self._dependents.setdefault(k, []).append(name)
+
+    def remove(self, name: str) -> None:
+        if name in self._inputs:
+            if self._dependents.get(name):
+                raise ValueError(f"'{name}' is used by: {', '.join(self._dependents[name])}")
+            del self._inputs[name]
+            self._dependents.pop(name, None)
+            return
+
+        node = self._nodes.pop(name)
+        for k in node.dependencies:
+            self._dependents[k].remove(name)
+
+    @property
+    def inputs(self) -> Tuple[str, ...]:
+        return tuple(self._inputs)
+
+    @property
+    def quantities(self) -> Tuple[str, ...]:
+        return tuple(self._nodes)
+
+    def dependencies(self, name: str) -> Tuple[str, ...]:
+        return self.__node(name).dependencies
+
+    def dependents(self, name: str) -> Tuple[str, ...]:
+        if name not in self._inputs:
+            raise KeyError(name)
+        return tuple(self._dependents.get(name, ()))
+
+    def is_dirty(self, name: str) -> bool:
+        return self.__node(name).result is None
+
+    @property
+    def dirty(self) -> Tuple[str, ...]:
+        return tuple(k for k, node in self._nodes.items() if node.result is None)
+
+    def evaluate(self, name: str) -> NumericData:
+        """Value and combined standard uncertainty of ``name`` for the current inputs"""
+        if name in self._inputs:
+            data = self.__reading(name)
+            if isinstance(data, get_registry().Measurement):
+                return NumericData(data.value.magnitude, str(data.units),
+                                   uncertainty=data.error.magnitude)
+            return NumericData(data.magnitude, str(data.units))
+
+        node = self.__node(name)
+        if node.result is None:
+            node.result = self.__evaluate(node)
+        return node.result
+
+    def recompute(self) -> Tuple[str, ...]:
+        """Evaluate every dirty quantity and return their names"""
+        names = self.dirty
+        for name in names:
+            self.evaluate(name)
+        return names
+
+    def to_latex(self, name: str, force_value: bool = False, symbolic_unit: bool = True) -> str:
+        node = self.__node(name)
+        key = (force_value, symbolic_unit)
+        text = node.latex.get(key)
+        if text is None:
+            if force_value:
+                text = self.evaluate(name)._repr_latex_(symbolic_unit=symbolic_unit)
+            else:
+                text = node.data._repr_latex_(symbolic_unit=symbolic_unit)
+            text = f"{latex.latex(sympy.Symbol(name))} = {text}"
+            node.latex[key] = text
+        return f"${text}$"
+
+    @profiling.timed("worksheet.evaluate")
+    def __evaluate(self, node: "_Node") -> NumericData:
+        if node.propagation is None:
+            node.propagation = UncertaintyPropagation(node.data, symbols=node.dependencies)
+
+        values = {}
+        uncertainties = {}
+        for k in node.dependencies:
+            data = self.__reading(k)
+            if isinstance(data, get_registry().Measurement):
+                data = data.value
+            values[k] = data
+            # The propagation takes uncertainties in the units the quantity was defined with
+            error = self._inputs[k].uncertainty
+            uncertainties[k] = 0 if error is None else \
+                _difference(error, data.units, node.data._base_symbols[k].units)
+        value, error = node.propagation.evaluate(values, uncertainties)
+        if not any(numpy.any(u) for u in uncertainties.values()):
+            return NumericData(value.value, value.unit)
+        return NumericData(value.value, value.unit, uncertainty=error.value)
+
+    def __reading(self, name: str) -> "pint.Quantity":
+        # The input itself is symbolic, its reading is kept as its base symbol
+        return self._inputs[name]._base_symbols[name]
+
+    def __node(self, name: str) -> "_Node":
+        if name not in self._nodes:
+            raise KeyError(name)
+        return self._nodes[name]
+
+    def __getitem__(self, name: str) -> PhysicsData:
+        """Symbolic PhysicsData of ``name`` to build other quantities from"""
+        if name in self._inputs:
+            return self._inputs[name]
+        return self.__node(name).data
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._inputs or name in self._nodes
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._inputs
+        yield from self._nodes
+
+    def __len__(self) -> int:
+        return len(self._inputs) + len(self._nodes)
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(inputs: {', '.join(self._inputs)}; "
+                f"quantities: {', '.join(self._nodes)})")
+
+
+def _difference(magnitude: Any, source: "pint.Unit", target: "pint.Unit") -> Any:
+    if source == target:
+        return magnitude
+    conversion = _conversion(source, target)
+    if conversion is None:
+        return get_registry().Quantity(magnitude, source).to(target).magnitude
+    # Uncertainties are differences, so the offset of units like degC doesn't apply
+    return magnitude * conversion[0]
+
+
+class _Node:
+    __slots__ = ("data", "dependencies", "propagation", "result", "latex")
+
+    def __init__(self, data: PhysicsData, dependencies: Tuple[str, ...]) -> None:
+        self.data = data
+        self.dependencies = dependencies
+        self.propagation = None
+        self.result = None
+        self.latex: Dict[Tuple[bool, bool], str] = {}
+
+    def invalidate(self) -> None:
+        self.result = None
+        # The LaTeX of the expression itself doesn't depend on the values
+        self.latex = {k: v for k, v in self.latex.items() if not k[0]}